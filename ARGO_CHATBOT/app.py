@@ -5,8 +5,9 @@ This is the main chat interface - for data management, use DATA_GENERATOR/app.py
 """
 
 import os
-import json
 import time
+import queue
+import threading
 from functools import wraps
 from flask import Flask, jsonify, request, send_from_directory, Response, stream_with_context
 from sqlalchemy import create_engine, text
@@ -61,6 +62,41 @@ STATIC_DIR = os.path.join(BASE_DIR, 'static')
 app = Flask(__name__, static_folder=STATIC_DIR, static_url_path='/static')
 CORS(app)
 
+# Serialize responses with orjson when installed (query results can be thousands of rows)
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson; dates keep Flask's default format."""
+        _options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=self._options).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+except ImportError:
+    pass
+
+# Gzip large JSON responses when Flask-Compress is installed. Result sets are
+# repetitive floats, so a fast level already gets most of the size reduction;
+# SSE streams are left uncompressed so chunks are flushed as they arrive.
+try:
+    from flask_compress import Compress
+
+    app.config.update(
+        COMPRESS_ALGORITHM='gzip',
+        COMPRESS_LEVEL=3,
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
+except ImportError:
+    pass
+
 # =============================================
 # CACHING - Optimized with LRU eviction & endpoint-specific TTLs
 # =============================================
@@ -77,7 +113,7 @@ CACHE_TTLS = {
     'get_floats': 600,       # Float list rarely changes
     'get_map_points': 180,   # Map points cached 3 min
     'get_data': 60,          # Data queries - moderate cache
-    'handle_query': 180,     # AI queries - cache for repeated questions
+    'test_ai': 120,          # LLM round-trip probe - avoid burning tokens on every poll
 }
 
 def _normalize_cache_key(key: str) -> str:
@@ -350,6 +386,7 @@ def health_check():
     })
 
 @app.route('/api/test-ai')
+@cached()  # Uses CACHE_TTLS['test_ai'] = 120s
 def test_ai():
     """Test AI connection."""
     try:
@@ -358,7 +395,8 @@ def test_ai():
         result = llm.invoke("Say hello in one word")
         return jsonify({"status": "ok", "response": result.content[:100]})
     except Exception as e:
-        return jsonify({"status": "error", "error": str(e)})
+        # Non-200 so cached() doesn't pin a failed probe for the full TTL
+        return jsonify({"status": "error", "error": str(e)}), 503
 
 @app.route('/api/status')
 @cached()  # Uses CACHE_TTLS['get_status'] = 60s
@@ -457,44 +495,6 @@ def get_stats():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# AI Query cache - separate from endpoint cache for smarter matching
-_query_cache = {}
-_query_cache_expiry = {}
-QUERY_CACHE_TTL = 300  # 5 minutes for repeated identical queries
-
-def _normalize_query(query: str) -> str:
-    """Normalize query for cache key matching."""
-    import re
-    # Lowercase, remove extra spaces, strip punctuation at end
-    normalized = query.lower().strip()
-    normalized = re.sub(r'\s+', ' ', normalized)
-    normalized = re.sub(r'[?.!]+$', '', normalized)
-    return normalized
-
-def get_cached_query(query: str):
-    """Get cached AI query result."""
-    key = _normalize_query(query)
-    if key in _query_cache:
-        if time.time() < _query_cache_expiry.get(key, 0):
-            return _query_cache[key]
-        else:
-            _query_cache.pop(key, None)
-            _query_cache_expiry.pop(key, None)
-    return None
-
-def cache_query_result(query: str, result: dict):
-    """Cache AI query result."""
-    key = _normalize_query(query)
-    # Only cache successful results with data
-    if result and 'error' not in result:
-        _query_cache[key] = result
-        _query_cache_expiry[key] = time.time() + QUERY_CACHE_TTL
-        # Limit cache size
-        if len(_query_cache) > 50:
-            oldest = min(_query_cache_expiry.keys(), key=lambda k: _query_cache_expiry[k])
-            _query_cache.pop(oldest, None)
-            _query_cache_expiry.pop(oldest, None)
-
 @app.route('/api/query', methods=['GET', 'POST'])
 def handle_query():
     """Handle natural language queries using AI - with intelligent caching."""
@@ -511,16 +511,9 @@ def handle_query():
     if not user_query:
         return jsonify({"error": "No query provided"}), 400
     
-    # Check query cache first for instant response on repeated questions
-    cached_result = get_cached_query(user_query)
-    if cached_result:
-        cached_result['cached'] = True  # Mark as cached response
-        return jsonify(cached_result)
-    
     try:
+        # Repeated questions are answered from brain's response cache
         response = get_intelligent_answer(user_query)
-        # Cache successful responses
-        cache_query_result(user_query, response)
         return jsonify(response)
     except Exception as e:
         import traceback
@@ -528,36 +521,66 @@ def handle_query():
         print(f"Query error: {error_detail}")
         return jsonify({"error": str(e), "detail": error_detail}), 500
 
-@app.route('/api/query/stream', methods=['POST'])
+# Longest gap allowed between pipeline events before the stream is abandoned
+# (covers intent parsing, the SQL query and each summary token)
+STREAM_IDLE_TIMEOUT = 120
+
+@app.route('/api/query/stream', methods=['GET', 'POST'])
 def handle_query_stream():
-    """Handle natural language queries with streaming response."""
+    """Handle natural language queries, streaming the summary as it is generated."""
     if not get_intelligent_answer:
         return jsonify({"error": "AI module not available"}), 500
     
-    data = request.get_json()
-    user_query = data.get('query', '')
+    if request.method == 'GET':
+        user_query = request.args.get('question', '') or request.args.get('query', '')
+    else:
+        data = request.get_json() or {}
+        user_query = data.get('query', '') or data.get('question', '')
     
     if not user_query:
         return jsonify({"error": "No query provided"}), 400
     
+    def event(payload):
+        return f"data: {app.json.dumps(payload)}\n\n"
+    
     def generate():
-        try:
-            response = get_intelligent_answer(user_query)
-            
-            # Send response in chunks
-            if 'answer' in response:
-                words = response['answer'].split(' ')
-                for i, word in enumerate(words):
-                    chunk = {'text': word + ' ', 'done': False}
-                    yield f"data: {json.dumps(chunk)}\n\n"
-                    time.sleep(0.02)
-            
-            # Send final chunk with full data
-            response['done'] = True
-            yield f"data: {json.dumps(response)}\n\n"
-            
-        except Exception as e:
-            yield f"data: {json.dumps({'error': str(e), 'done': True})}\n\n"
+        yield event({'type': 'start'})
+        # Run the pipeline in a worker and forward summary tokens as they arrive
+        tokens = queue.Queue()
+        done = object()
+        result = {}
+        
+        def worker():
+            try:
+                result['response'] = get_intelligent_answer(user_query, on_token=tokens.put)
+            except Exception as e:
+                result['error'] = e
+            finally:
+                tokens.put(done)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        streamed = False
+        while True:
+            try:
+                token = tokens.get(timeout=STREAM_IDLE_TIMEOUT)
+            except queue.Empty:
+                yield event({'type': 'error', 'message': 'The AI service stopped responding. Please try again.'})
+                return
+            if token is done:
+                break
+            streamed = True
+            yield event({'type': 'chunk', 'content': token})
+        
+        if 'error' in result:
+            yield event({'type': 'error', 'message': str(result['error'])})
+            return
+        response = result['response']
+        
+        # Cached / conversational answers arrive whole
+        if not streamed and response.get('summary'):
+            yield event({'type': 'chunk', 'content': response['summary']})
+        yield event({'type': 'data', **response})
+        yield event({'type': 'done'})
     
     return Response(
         stream_with_context(generate()),
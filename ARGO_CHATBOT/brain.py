@@ -10,13 +10,140 @@ from datetime import datetime
 import numpy as np
 import sql_builder
 import time
+import hashlib
+import functools
+import threading
+import random
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+try:
+    import orjson  # Optional: C serializer, handles numpy/datetime natively
+except ImportError:
+    orjson = None
+
+try:
+    import connectorx  # Optional: Rust reader for large result sets (USE_CONNECTORX=true)
+except ImportError:
+    connectorx = None
+
+
+def _json_dumps(obj):
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC).decode()
+    return json.dumps(obj, default=str)
+
+def _json_loads(text):
+    """Parse a JSON string, using orjson when it is installed.
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 # ------------------------------------------------------------------
 # 🧠 AI PROVIDER - Groq (100% FREE & UNLIMITED)
 # Using Llama 3.3 70B for all queries - fast, free, and excellent quality
 # ------------------------------------------------------------------
 
-def classify_query_complexity(question: str) -> str:
+# Patterns that mark a query as 'simple', fused into one alternation at import
+_SIMPLE_PATTERNS = [
+    # Greetings
+    r'^(hi|hello|hey|hola|howdy|sup|yo)[\s!?.]*$',
+    r"^what'?s?\s*up",
+    r'^good\s*(morning|afternoon|evening|night)',
+    # Thanks/bye
+    r'^(thanks?|thx|thank\s*you|bye|goodbye|cya|see\s*ya)',
+    # Identity questions
+    r'^(who|what)\s*(are|r)\s*(you|u)',
+    r'^(your|ur)\s*name',
+    # Help
+    r'^help$',
+    r'^(what|how)\s*(can|do)\s*(you|u)\s*(do|help)',
+    # Simple math
+    r'^\d+\s*[\+\-\*\/]\s*\d+',
+    # Yes/no
+    r'^(yes|no|yeah|nope|ok|okay|sure)[\s!?.]*$',
+]
+_SIMPLE_QUERY_RE = re.compile("|".join(f"(?:{p})" for p in _SIMPLE_PATTERNS))
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_FLOAT_ID_RE = re.compile(r'float\s*(?:id)?\s*(\d+)')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+# Per-request extraction patterns, compiled once at import
+_MD_FENCE_OPEN_RE = re.compile(r'^```\w*\s*')
+_MD_FENCE_CLOSE_RE = re.compile(r'\s*```$')
+
+# Coordinate / limit / proximity hints, found in one scan of the question.
+_QUESTION_HINTS_RE = re.compile(
+    r'(?P<lat>latitude\s+(?P<lat_v>-?\d+(?:\.\d+)?))'
+    r'|(?P<lon>longitude\s+(?P<lon_v>-?\d+(?:\.\d+)?))'
+    r'|(?P<limit>(?P<limit_kw>nearest|top|find)\s+(?P<limit_v>\d{1,3})\s+(?:float|ARGO))'
+    r'|(?P<near>nearest|within\s+\d+\s*km)',
+    re.IGNORECASE)
+# Bare number pair ('near 13, 80.25', 'latitude 13 80'). Kept out of the scan above
+# because it overlaps the keyword hits, which would consume its numbers
+_COORD_PAIR_RE = re.compile(r'(?:near|at|around)?\s*(-?\d+(?:\.\d+)?)\s*[, ]\s*(-?\d+(?:\.\d+)?)', re.IGNORECASE)
+_MONTH_YEAR_RE = re.compile(r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s*(\d{4})\b', re.IGNORECASE)
+_DATA_YEAR_RE = re.compile(r'\b(20[12]\d)\b')
+_DIGITS_RE = re.compile(r'\d+')
+
+def _keyword_re(keywords):
+    """One compiled substring matcher for many keywords (longest alternatives first)."""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+_OCEAN_KEYWORDS_RE = _keyword_re([
+    'float', 'argo', 'ocean', 'temperature', 'salinity',
+    'depth', 'pressure', 'trajectory', 'data', 'sea',
+])
+_COMPLEX_INDICATORS_RE = _keyword_re([
+    # Ocean/ARGO specific
+    'float', 'argo', 'ocean', 'temperature', 'salinity', 'pressure',
+    'depth', 'trajectory', 'maritime', 'marine', 'sea', 'water',
+    'latitude', 'longitude', 'coordinate', 'region', 'basin',
+    # Data analysis
+    'average', 'mean', 'maximum', 'minimum', 'trend', 'analyze',
+    'compare', 'statistics', 'count', 'how many', 'show', 'find',
+    'nearest', 'closest', 'between', 'from', 'during', 'in year',
+    # Location names (likely ocean queries)
+    'bay', 'gulf', 'pacific', 'atlantic', 'indian', 'mediterranean',
+    'chennai', 'mumbai', 'arabian', 'bengal', 'caribbean',
+])
+_FALLBACK_LOCATION_RE = _keyword_re([
+    "chennai", "mumbai", "bay of bengal", "arabian sea", "indian ocean",
+    "pacific", "atlantic", "mediterranean", "caribbean", "kolkata", "goa",
+])
+
+# Conversational keyword groups (matched against the punctuation-free question)
+_CONVERSATION_PATTERNS = {
+    "greeting": _keyword_re(['hello', 'hi', 'hey', 'hola', 'greetings', 'good morning', 'good afternoon',
+                             'good evening', 'howdy', 'sup', 'whats up', "what's up", 'yo']),
+    "help": _keyword_re(['help', 'what can you do', 'how do i use', 'how does this work',
+                         'what is this', 'capabilities', 'features', 'commands']),
+    "about": _keyword_re(['who are you', 'what are you', 'tell me about yourself',
+                          'introduce yourself', 'your name']),
+    "thanks": _keyword_re(['thank', 'thanks', 'thx', 'appreciate', 'grateful']),
+    "bye": _keyword_re(['bye', 'goodbye', 'see you', 'later', 'cya', 'take care']),
+}
+
+def analyze_question(question: str) -> dict:
+    """
+    Normalize a question once and tag it with every keyword group it matches.
+    Shared by handle_conversational_query and classify_query_complexity so the
+    question is only lowercased, cleaned and scanned once per request.
+    """
+    question_lower = question.strip().lower()
+    question_clean = _NON_WORD_RE.sub('', question_lower)
+    tags = {tag for tag, pattern in _CONVERSATION_PATTERNS.items() if pattern.search(question_clean)}
+    if _SIMPLE_QUERY_RE.search(question_lower):
+        tags.add("simple")
+    if _OCEAN_KEYWORDS_RE.search(question_lower):
+        tags.add("ocean")
+    if _COMPLEX_INDICATORS_RE.search(question_lower):
+        tags.add("complex")
+    return {"lower": question_lower, "clean": question_clean, "words": question_clean.split(), "tags": tags}
+
+def classify_query_complexity(question: str, analysis: dict = None) -> str:
     """
     Classify a user query as 'simple' or 'complex' to route to appropriate AI.
     
@@ -24,57 +151,21 @@ def classify_query_complexity(question: str) -> str:
         'simple' - Greetings, small talk, basic questions → Groq (fast)
         'complex' - Ocean data queries, analysis, reasoning → DeepSeek (reliable)
     """
-    question_lower = question.strip().lower()
-    question_clean = re.sub(r'[^\w\s]', '', question_lower)
-    words = question_clean.split()
+    analysis = analysis or analyze_question(question)
+    tags = analysis["tags"]
+    words = analysis["words"]
     
     # === SIMPLE PATTERNS (use Groq for speed) ===
-    simple_patterns = [
-        # Greetings
-        r'^(hi|hello|hey|hola|howdy|sup|yo)[\s!?.]*$',
-        r"^what'?s?\s*up",
-        r'^good\s*(morning|afternoon|evening|night)',
-        # Thanks/bye
-        r'^(thanks?|thx|thank\s*you|bye|goodbye|cya|see\s*ya)',
-        # Identity questions
-        r'^(who|what)\s*(are|r)\s*(you|u)',
-        r'^(your|ur)\s*name',
-        # Help
-        r'^help$',
-        r'^(what|how)\s*(can|do)\s*(you|u)\s*(do|help)',
-        # Simple math
-        r'^\d+\s*[\+\-\*\/]\s*\d+',
-        # Yes/no
-        r'^(yes|no|yeah|nope|ok|okay|sure)[\s!?.]*$',
-    ]
-    
-    for pattern in simple_patterns:
-        if re.search(pattern, question_lower):
-            return 'simple'
+    if "simple" in tags:
+        return 'simple'
     
     # Very short queries (1-3 words) without ocean keywords are simple
     if len(words) <= 3:
-        ocean_keywords = ['float', 'argo', 'ocean', 'temperature', 'salinity', 
-                         'depth', 'pressure', 'trajectory', 'data', 'sea']
-        if not any(kw in question_lower for kw in ocean_keywords):
+        if "ocean" not in tags:
             return 'simple'
     
     # === COMPLEX PATTERNS (use DeepSeek for reliability) ===
-    complex_indicators = [
-        # Ocean/ARGO specific
-        'float', 'argo', 'ocean', 'temperature', 'salinity', 'pressure',
-        'depth', 'trajectory', 'maritime', 'marine', 'sea', 'water',
-        'latitude', 'longitude', 'coordinate', 'region', 'basin',
-        # Data analysis
-        'average', 'mean', 'maximum', 'minimum', 'trend', 'analyze',
-        'compare', 'statistics', 'count', 'how many', 'show', 'find',
-        'nearest', 'closest', 'between', 'from', 'during', 'in year',
-        # Location names (likely ocean queries)
-        'bay', 'gulf', 'pacific', 'atlantic', 'indian', 'mediterranean',
-        'chennai', 'mumbai', 'arabian', 'bengal', 'caribbean',
-    ]
-    
-    if any(indicator in question_lower for indicator in complex_indicators):
+    if "complex" in tags:
         return 'complex'
     
     # Multi-word queries are generally complex
@@ -85,9 +176,67 @@ def classify_query_complexity(question: str) -> str:
     return 'complex'
 
 
+# Read .env once at import; provider getters below memoize the clients they
+# build, so each client (and its langchain import) is built once per process.
+load_dotenv()
+
+# Per-provider call timeouts in seconds (roughly p95 latency plus margin)
+LLM_CALL_TIMEOUTS = {
+    "Groq Llama": 8,
+    "DeepSeek": 20,
+    "OpenAI GPT-4o": 30,
+    "Anthropic Claude": 30,
+    "Google Gemini": 20,
+    "Groq Llama 8B": 8,
+    "OpenAI GPT-4o-mini": 20,
+}
+# Hard deadline enforcement for clients that ignore their own timeout.
+# The pool is also the LLM bulkhead: at most LLM_MAX_CONCURRENCY calls run at
+# once and extra calls are rejected immediately instead of queueing, so a
+# stalled provider can't tie up every request thread. (DB work is bounded
+# separately by the engine pool and its pool_timeout.)
+LLM_MAX_CONCURRENCY = 8
+_llm_pool = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+_llm_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+# Small shared pool for DB lookups and summary reductions that overlap other
+# per-request work (an in-flight LLM call, records conversion)
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="io")
+
+
+class LLMBusyError(RuntimeError):
+    """Raised when every LLM slot is taken; callers should degrade, not wait."""
+
+
+def _run_in_llm_slot(fn, *args):
+    try:
+        return fn(*args)
+    finally:
+        _llm_slots.release()
+
+
+_llm_clients = {}  # getter name -> constructed client (successes only)
+
+
+def _memoize_client(getter):
+    """
+    Cache a provider getter's client once it is built. A None result (no key
+    yet, or a transient construction error) is not cached, so the provider is
+    retried on the next call instead of staying disabled for the worker's life.
+    """
+    @functools.wraps(getter)
+    def wrapper():
+        client = _llm_clients.get(getter.__name__)
+        if client is None:
+            client = getter()
+            if client is not None:
+                _llm_clients[getter.__name__] = client
+        return client
+    return wrapper
+
+
+@_memoize_client
 def get_groq_llm():
     """Get Groq LLM for fast, simple queries."""
-    load_dotenv()
     groq_key = os.getenv("GROQ_API_KEY")
     if groq_key:
         try:
@@ -97,16 +246,57 @@ def get_groq_llm():
                 model=model,
                 temperature=0,
                 api_key=groq_key,
-                max_retries=2
+                max_retries=2,
+                request_timeout=LLM_CALL_TIMEOUTS["Groq Llama"]
             )
         except Exception as e:
             print(f"⚠ Groq unavailable: {e}")
     return None
 
 
+@_memoize_client
+def get_groq_intent_llm():
+    """Get a small Groq model for structured intent extraction."""
+    groq_key = os.getenv("GROQ_API_KEY")
+    if groq_key:
+        try:
+            from langchain_groq import ChatGroq
+            model = os.getenv("GROQ_INTENT_MODEL", "llama-3.1-8b-instant")
+            return ChatGroq(
+                model=model,
+                temperature=0,
+                api_key=groq_key,
+                max_retries=2,
+                request_timeout=LLM_CALL_TIMEOUTS["Groq Llama 8B"]
+            )
+        except Exception as e:
+            print(f"⚠ Groq intent model unavailable: {e}")
+    return None
+
+
+@_memoize_client
+def get_openai_intent_llm():
+    """Get a small OpenAI model for structured intent extraction (premium mode)."""
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if openai_key:
+        try:
+            from langchain_openai import ChatOpenAI
+            model = os.getenv("OPENAI_INTENT_MODEL", "gpt-4o-mini")
+            return ChatOpenAI(
+                model=model,
+                temperature=0,
+                api_key=openai_key,
+                max_retries=2,
+                request_timeout=LLM_CALL_TIMEOUTS["OpenAI GPT-4o-mini"]
+            )
+        except Exception as e:
+            print(f"⚠ OpenAI intent model unavailable: {e}")
+    return None
+
+
+@_memoize_client
 def get_deepseek_llm():
     """Get DeepSeek LLM for complex reasoning queries."""
-    load_dotenv()
     deepseek_key = os.getenv("DEEPSEEK_API_KEY")
     if deepseek_key:
         try:
@@ -117,16 +307,17 @@ def get_deepseek_llm():
                 temperature=0,
                 api_key=deepseek_key,
                 base_url="https://api.deepseek.com/v1",
-                max_retries=3
+                max_retries=3,
+                request_timeout=LLM_CALL_TIMEOUTS["DeepSeek"]
             )
         except Exception as e:
             print(f"⚠ DeepSeek unavailable: {e}")
     return None
 
 
+@_memoize_client
 def get_openai_llm():
     """Get OpenAI LLM (premium option)."""
-    load_dotenv()
     openai_key = os.getenv("OPENAI_API_KEY")
     if openai_key:
         try:
@@ -137,16 +328,16 @@ def get_openai_llm():
                 temperature=0,
                 api_key=openai_key,
                 max_retries=3,
-                request_timeout=30
+                request_timeout=LLM_CALL_TIMEOUTS["OpenAI GPT-4o"]
             )
         except Exception as e:
             print(f"⚠ OpenAI unavailable: {e}")
     return None
 
 
+@_memoize_client
 def get_anthropic_llm():
     """Get Anthropic Claude LLM (premium option)."""
-    load_dotenv()
     anthropic_key = os.getenv("ANTHROPIC_API_KEY")
     if anthropic_key:
         try:
@@ -157,16 +348,16 @@ def get_anthropic_llm():
                 temperature=0,
                 api_key=anthropic_key,
                 max_retries=3,
-                timeout=30
+                timeout=LLM_CALL_TIMEOUTS["Anthropic Claude"]
             )
         except Exception as e:
             print(f"⚠ Anthropic unavailable: {e}")
     return None
 
 
+@_memoize_client
 def get_gemini_llm():
     """Get Google Gemini LLM (fallback option)."""
-    load_dotenv()
     gemini_key = os.getenv("GOOGLE_API_KEY")
     if gemini_key:
         try:
@@ -176,14 +367,94 @@ def get_gemini_llm():
                 model=model,
                 google_api_key=gemini_key,
                 temperature=0,
-                max_retries=3
+                max_retries=3,
+                timeout=LLM_CALL_TIMEOUTS["Google Gemini"]
             )
         except Exception as e:
             print(f"⚠ Gemini unavailable: {e}")
     return None
 
 
+def get_intent_llm_with_provider(query_complexity=None):
+    """
+    Intent parsing only fills a small JSON object, so route it to a fast,
+    cheap model and keep the main model for summaries. Falls back to the
+    normal router when no small model is available (or
+    USE_CHEAP_INTENT_MODEL=false).
+    """
+    if os.getenv("USE_CHEAP_INTENT_MODEL", "true").lower() == "true":
+        if os.getenv("USE_PREMIUM_AI", "false").lower() == "true":
+            candidates = [("OpenAI GPT-4o-mini", get_openai_intent_llm), ("Groq Llama 8B", get_groq_intent_llm)]
+        else:
+            candidates = [("Groq Llama 8B", get_groq_intent_llm)]
+        for name, get_provider in candidates:
+            if _circuit_is_open(name):
+                continue
+            llm = get_provider()
+            if llm:
+                return name, llm
+    return get_llm_with_provider(for_task="parsing", query_complexity=query_complexity)
+
+
+# ------------------------------------------------------------------
+# Circuit breaker per LLM provider: after CIRCUIT_FAIL_MAX consecutive
+# failures a provider is skipped for CIRCUIT_RESET_TIMEOUT seconds, then
+# a single trial call is allowed (half-open): the first thread to see the
+# timeout elapse owns the probe and every other caller keeps skipping the
+# provider until that probe succeeds (circuit closes) or fails (re-opens).
+# A probe that never reports back (slot busy, client missing) expires
+# after another CIRCUIT_RESET_TIMEOUT so the circuit can't wedge half-open.
+# ------------------------------------------------------------------
+CIRCUIT_FAIL_MAX = 5
+CIRCUIT_RESET_TIMEOUT = 30
+# provider name -> [consecutive_failures, opened_at, probe_thread, probe_started]
+_circuit_state = {}
+_circuit_lock = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit is open and the call is skipped."""
+
+
+def _circuit_is_open(provider):
+    now = time.time()
+    with _circuit_lock:
+        state = _circuit_state.get(provider)
+        if not state or state[1] is None:
+            return False
+        if now - state[1] < CIRCUIT_RESET_TIMEOUT:
+            return True
+        me = threading.get_ident()
+        if state[2] is not None and state[2] != me and now - state[3] < CIRCUIT_RESET_TIMEOUT:
+            return True  # another request is probing; keep skipping
+        # Half-open: this thread owns the trial call (re-checks by the owner stay closed)
+        state[2], state[3] = me, now
+        return False
+
+
+def _record_provider_result(provider, success):
+    with _circuit_lock:
+        if success:
+            _circuit_state.pop(provider, None)
+            return
+        state = _circuit_state.setdefault(provider, [0, None, None, None])
+        state[0] += 1
+        if state[0] >= CIRCUIT_FAIL_MAX:
+            state[1] = time.time()
+            state[2] = state[3] = None
+            opened = True
+        else:
+            opened = False
+    if opened:
+        print(f"⚡ {provider} circuit OPEN for {CIRCUIT_RESET_TIMEOUT}s")
+
+
 def get_llm(for_task="general", query_complexity=None):
+    """Return the LLM chosen by get_llm_with_provider (see routing table there)."""
+    return get_llm_with_provider(for_task, query_complexity)[1]
+
+
+def get_llm_with_provider(for_task="general", query_complexity=None, exclude=()):
     """
     🧠 SMART AI ROUTER - Get the best LLM based on query complexity.
     
@@ -199,12 +470,11 @@ def get_llm(for_task="general", query_complexity=None):
     Args:
         for_task: "parsing" for intent extraction, "summary" for response generation
         query_complexity: 'simple' or 'complex' (if None, defaults to complex)
+        exclude: provider names to skip (already failed for this request)
     
     Returns:
-        LLM instance ready for use
+        (provider name, LLM instance) ready for use
     """
-    load_dotenv()
-    
     # Check if premium mode is enabled (user has paid API keys)
     use_premium = os.getenv("USE_PREMIUM_AI", "false").lower() == "true"
     
@@ -230,13 +500,21 @@ def get_llm(for_task="general", query_complexity=None):
             ("Anthropic Claude", get_anthropic_llm),
         ]
     
-    # Try providers in order until one works
+    # Try providers in order until one works, skipping tripped circuits
+    skipped_open = False
     for name, get_provider in providers:
+        if name in exclude:
+            continue
+        if _circuit_is_open(name):
+            skipped_open = True
+            continue
         llm = get_provider()
         if llm:
             print(f"[OK] Using {name}")
-            return llm
+            return name, llm
     
+    if skipped_open or exclude:
+        raise RuntimeError("All configured LLM API providers are temporarily unavailable. Please try again shortly.")
     raise RuntimeError(
         "ERROR: No working LLM found! Please set at least one API key:\n"
         "\n  FREE OPTIONS (Recommended):\n"
@@ -252,22 +530,165 @@ def get_llm(for_task="general", query_complexity=None):
     )
 
 
-def invoke_with_retry(chain, inputs, max_retries=2, delay=0.5):
+def invoke_with_retry(chain, inputs, max_retries=2, delay=0.5, provider=None, timeout=None):
     """
     Invoke LLM chain with retry logic for robustness.
+    If provider is given, calls are tracked by its circuit breaker and an
+    open circuit fails immediately instead of sleeping through retries.
+    A timeout (seconds) caps each attempt even if the client hangs.
     """
     last_error = None
     for attempt in range(max_retries):
+        if provider and _circuit_is_open(provider):
+            raise CircuitOpenError(f"{provider} circuit is open")
         try:
-            return chain.invoke(inputs)
+            if timeout:
+                if not _llm_slots.acquire(blocking=False):
+                    raise LLMBusyError("LLM API capacity reached, please retry shortly")
+                result = _llm_pool.submit(_run_in_llm_slot, chain.invoke, inputs).result(timeout=timeout)
+            else:
+                result = chain.invoke(inputs)
+            if provider:
+                _record_provider_result(provider, True)
+            return result
+        except LLMBusyError:
+            raise  # local saturation, not a provider failure
         except Exception as e:
             last_error = e
+            if provider:
+                _record_provider_result(provider, False)
             print(f"⚠ LLM call failed (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
-                time.sleep(delay)  # Quick retry
+                # Jittered exponential backoff so concurrent retries don't fire in lockstep
+                time.sleep(min(random.uniform(delay, delay * 2 ** (attempt + 1)), 10))
     raise last_error
 
 
+_chain_cache = {}  # (prompt key, provider name) -> prompt | llm | parser
+
+# OpenAI-compatible APIs that accept response_format={"type": "json_object"}.
+# JSON mode constrains decoding to a single valid object, so the intent reply
+# never carries markdown fences or explanations.
+_JSON_MODE_PROVIDERS = {"Groq Llama", "Groq Llama 8B", "DeepSeek", "OpenAI GPT-4o", "OpenAI GPT-4o-mini"}
+
+def get_chain(prompt_key, provider, llm):
+    """Return the cached prompt | llm | StrOutputParser chain for a provider."""
+    chain = _chain_cache.get((prompt_key, provider))
+    if chain is None:
+        if prompt_key == "intent" and provider in _JSON_MODE_PROVIDERS:
+            llm = llm.bind(response_format={"type": "json_object"})
+        chain = _PROMPTS[prompt_key] | llm | StrOutputParser()
+        _chain_cache[(prompt_key, provider)] = chain
+    return chain
+
+
+def invoke_with_failover(prompt_key, inputs, provider, llm, query_complexity=None, max_retries=2):
+    """
+    Run the cached chain for prompt_key with retries, moving on to the next
+    provider in the routing order when this one fails or its circuit opens.
+    """
+    tried = set()
+    last_error = None
+    while True:
+        tried.add(provider)
+        try:
+            return invoke_with_retry(get_chain(prompt_key, provider, llm), inputs, max_retries=max_retries,
+                                     provider=provider, timeout=LLM_CALL_TIMEOUTS.get(provider, 30))
+        except LLMBusyError:
+            raise
+        except Exception as e:
+            last_error = e
+            print(f"⚠ {provider} failed, trying next provider: {e}")
+        try:
+            provider, llm = get_llm_with_provider(query_complexity=query_complexity, exclude=tried)
+        except RuntimeError:
+            raise last_error
+
+
+def stream_with_failover(prompt_key, inputs, provider, llm, on_token, query_complexity=None):
+    """
+    Stream the chain output through on_token as it is generated and return the
+    full text. If the provider fails before the first token, fall back to
+    invoke_with_failover and emit its answer as a single chunk.
+    The stream runs in the LLM pool and must finish within the provider's
+    LLM_CALL_TIMEOUTS entry; a stall past that counts as a provider failure.
+    """
+    parts = []
+    if not _circuit_is_open(provider) and _llm_slots.acquire(blocking=False):
+        timeout = LLM_CALL_TIMEOUTS.get(provider, 30)
+        chunks = queue.Queue()
+        end = object()
+        abandoned = threading.Event()
+
+        def pump():
+            try:
+                for chunk in get_chain(prompt_key, provider, llm).stream(inputs):
+                    if abandoned.is_set():
+                        break  # caller gave up; stop pulling tokens
+                    chunks.put((chunk, None))
+                chunks.put((end, None))
+            except Exception as e:
+                chunks.put((None, e))
+
+        _llm_pool.submit(_run_in_llm_slot, pump)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    chunk, error = chunks.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    raise TimeoutError(f"{provider} stream exceeded {timeout}s")
+                if error is not None:
+                    raise error
+                if chunk is end:
+                    break
+                parts.append(chunk)
+                on_token(chunk)
+            _record_provider_result(provider, True)
+            return "".join(parts)
+        except Exception as e:
+            abandoned.set()
+            _record_provider_result(provider, False)
+            if parts:
+                raise  # tokens already reached the client, don't repeat them
+            print(f"⚠ {provider} stream failed, falling back: {e}")
+    result = invoke_with_failover(prompt_key, inputs, provider, llm, query_complexity)
+    on_token(result)
+    return result
+
+
+def _extract_json_object(s: str):
+    """
+    Return the first balanced {...} object in s, or None.
+    Single linear pass tracking brace depth and string literals, so braces
+    inside quoted values don't end the object early.
+    """
+    start = s.find('{')
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(s)):
+        ch = s[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return s[start:i + 1]
+    return None
+
+
 def _fallback_intent_parser(question: str) -> dict:
     """
     Fallback regex-based intent parser when LLM fails.
@@ -299,22 +720,19 @@ def _fallback_intent_parser(question: str) -> dict:
         intent["query_type"] = "Scatter"
     
     # Extract float ID
-    float_match = re.search(r'float\s*(?:id)?\s*(\d+)', question_lower)
+    float_match = _FLOAT_ID_RE.search(question_lower)
     if float_match:
         intent["float_id"] = int(float_match.group(1))
     
     # Extract year
-    year_match = re.search(r'\b(20\d{2})\b', question)
+    year_match = _YEAR_RE.search(question)
     if year_match:
         intent["year"] = int(year_match.group(1))
     
     # Extract location
-    location_keywords = ["chennai", "mumbai", "bay of bengal", "arabian sea", "indian ocean", 
-                        "pacific", "atlantic", "mediterranean", "caribbean", "kolkata", "goa"]
-    for loc in location_keywords:
-        if loc in question_lower:
-            intent["location_name"] = loc
-            break
+    location_hits = _FALLBACK_LOCATION_RE.findall(question_lower)
+    if location_hits:
+        intent["location_name"] = max(location_hits, key=len)
     
     # Extract metrics
     metrics = []
@@ -353,320 +771,456 @@ def get_engine():
     if "cockroach" in db_url.lower() and "sslmode=verify-full" in db_url:
         db_url = db_url.replace("sslmode=verify-full", "sslmode=require")
     
+    connect_args = {
+        "application_name": "floatchart",
+        # Stop runaway analytic queries server-side instead of holding a worker
+        "options": f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT_MS', '15000')}",
+    }
+    if "cockroach" in db_url.lower():
+        connect_args["sslmode"] = "require"
+    
     _ENGINE = create_engine(
         db_url,
         pool_pre_ping=True,
-        pool_size=2,
-        max_overflow=3,
-        connect_args={"sslmode": "require"} if "cockroach" in db_url.lower() else {}
+        pool_size=int(os.getenv("DB_POOL_SIZE", "4")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "6")),
+        pool_recycle=1800,   # Recycle before server/load-balancer idle cutoffs
+        pool_timeout=5,      # Fail fast under exhaustion instead of stalling the request
+        connect_args=connect_args
     )
     return _ENGINE
 
+def _connectorx_url(engine):
+    """The engine's URL in the plain postgresql:// form connectorx understands."""
+    url = engine.url.set(drivername="postgresql")
+    if "cockroach" in engine.url.drivername and "sslmode" not in url.query:
+        url = url.update_query_dict({"sslmode": "require"})
+    return url.render_as_string(hide_password=False)
+
+def _redact_db_secret(message, engine, url):
+    """Strip the password-bearing URL (and the bare password) from an error message."""
+    message = message.replace(url, engine.url.render_as_string(hide_password=True))
+    password = engine.url.password
+    return message.replace(str(password), "***") if password else message
+
+def read_sql_frame(engine, sql, params=None):
+    """
+    Run a SELECT into a DataFrame. With USE_CONNECTORX=true and connectorx
+    installed, rows are decoded straight into arrays without per-row Python
+    objects; otherwise (or if connectorx fails) use pd.read_sql_query on the pool.
+    connectorx opens its own connection per call, so it only pays off for
+    large result sets - hence opt-in. It cannot bind parameters, so the
+    builder's :named params (plain numbers and IDs) are rendered inline by
+    the engine's dialect for that path only.
+    """
+    if connectorx is not None and os.getenv("USE_CONNECTORX", "false").lower() == "true":
+        url = _connectorx_url(engine)
+        try:
+            cx_sql = sql
+            if params:
+                cx_sql = str(text(sql).bindparams(**params).compile(
+                    dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            return connectorx.read_sql(url, cx_sql.rstrip().rstrip(";"), return_type="pandas")
+        except Exception as e:
+            print(f"⚠ connectorx read failed, using SQLAlchemy: {_redact_db_secret(str(e), engine, url)}")
+    with engine.connect() as connection:
+        return pd.read_sql_query(sql=text(sql), con=connection, params=params or None)
+
 db_context = {}
-LOCATIONS = {
+LOCATION_BOUNDS = {
     # ==========================================
     # INDIAN OCEAN REGIONS
     # ==========================================
-    "indian ocean": "(\"latitude\" BETWEEN -40 AND 25 AND \"longitude\" BETWEEN 30 AND 120)",
-    "arabian sea": "(\"latitude\" BETWEEN 5 AND 25 AND \"longitude\" BETWEEN 50 AND 75)",
-    "bay of bengal": "(\"latitude\" BETWEEN 5 AND 22 AND \"longitude\" BETWEEN 80 AND 95)",
-    "andaman sea": "(\"latitude\" BETWEEN 5 AND 15 AND \"longitude\" BETWEEN 92 AND 98)",
-    "laccadive sea": "(\"latitude\" BETWEEN 8 AND 14 AND \"longitude\" BETWEEN 71 AND 77)",
-    "red sea": "(\"latitude\" BETWEEN 12 AND 30 AND \"longitude\" BETWEEN 32 AND 44)",
-    "persian gulf": "(\"latitude\" BETWEEN 24 AND 30 AND \"longitude\" BETWEEN 48 AND 56)",
-    "gulf of oman": "(\"latitude\" BETWEEN 22 AND 27 AND \"longitude\" BETWEEN 56 AND 62)",
-    "gulf of aden": "(\"latitude\" BETWEEN 10 AND 15 AND \"longitude\" BETWEEN 43 AND 51)",
-    "mozambique channel": "(\"latitude\" BETWEEN -25 AND -10 AND \"longitude\" BETWEEN 35 AND 45)",
+    "indian ocean": (-40, 25, 30, 120),
+    "arabian sea": (5, 25, 50, 75),
+    "bay of bengal": (5, 22, 80, 95),
+    "andaman sea": (5, 15, 92, 98),
+    "laccadive sea": (8, 14, 71, 77),
+    "red sea": (12, 30, 32, 44),
+    "persian gulf": (24, 30, 48, 56),
+    "gulf of oman": (22, 27, 56, 62),
+    "gulf of aden": (10, 15, 43, 51),
+    "mozambique channel": (-25, -10, 35, 45),
     
     # ==========================================
     # PACIFIC OCEAN REGIONS
     # ==========================================
-    "pacific ocean": "(\"latitude\" BETWEEN -60 AND 60 AND \"longitude\" BETWEEN 100 AND 180)",
-    "north pacific": "(\"latitude\" BETWEEN 0 AND 60 AND \"longitude\" BETWEEN 100 AND 180)",
-    "south pacific": "(\"latitude\" BETWEEN -60 AND 0 AND \"longitude\" BETWEEN 100 AND 180)",
-    "south china sea": "(\"latitude\" BETWEEN 0 AND 25 AND \"longitude\" BETWEEN 100 AND 121)",
-    "philippine sea": "(\"latitude\" BETWEEN 5 AND 35 AND \"longitude\" BETWEEN 120 AND 140)",
-    "coral sea": "(\"latitude\" BETWEEN -25 AND -10 AND \"longitude\" BETWEEN 145 AND 165)",
-    "tasman sea": "(\"latitude\" BETWEEN -45 AND -30 AND \"longitude\" BETWEEN 150 AND 175)",
-    "east china sea": "(\"latitude\" BETWEEN 25 AND 33 AND \"longitude\" BETWEEN 120 AND 130)",
-    "sea of japan": "(\"latitude\" BETWEEN 35 AND 52 AND \"longitude\" BETWEEN 127 AND 142)",
-    "java sea": "(\"latitude\" BETWEEN -8 AND -3 AND \"longitude\" BETWEEN 105 AND 120)",
-    "banda sea": "(\"latitude\" BETWEEN -8 AND -4 AND \"longitude\" BETWEEN 122 AND 132)",
-    "celebes sea": "(\"latitude\" BETWEEN 0 AND 7 AND \"longitude\" BETWEEN 118 AND 127)",
-    "sulu sea": "(\"latitude\" BETWEEN 5 AND 12 AND \"longitude\" BETWEEN 118 AND 123)",
+    "pacific ocean": (-60, 60, 100, 180),
+    "north pacific": (0, 60, 100, 180),
+    "south pacific": (-60, 0, 100, 180),
+    "south china sea": (0, 25, 100, 121),
+    "philippine sea": (5, 35, 120, 140),
+    "coral sea": (-25, -10, 145, 165),
+    "tasman sea": (-45, -30, 150, 175),
+    "east china sea": (25, 33, 120, 130),
+    "sea of japan": (35, 52, 127, 142),
+    "java sea": (-8, -3, 105, 120),
+    "banda sea": (-8, -4, 122, 132),
+    "celebes sea": (0, 7, 118, 127),
+    "sulu sea": (5, 12, 118, 123),
     
     # ==========================================
     # ATLANTIC OCEAN REGIONS
     # ==========================================
-    "atlantic ocean": "(\"latitude\" BETWEEN -60 AND 60 AND \"longitude\" BETWEEN -80 AND 0)",
-    "north atlantic": "(\"latitude\" BETWEEN 0 AND 60 AND \"longitude\" BETWEEN -80 AND 0)",
-    "south atlantic": "(\"latitude\" BETWEEN -60 AND 0 AND \"longitude\" BETWEEN -70 AND 20)",
-    "caribbean sea": "(\"latitude\" BETWEEN 10 AND 22 AND \"longitude\" BETWEEN -88 AND -60)",
-    "gulf of mexico": "(\"latitude\" BETWEEN 18 AND 30 AND \"longitude\" BETWEEN -98 AND -80)",
-    "mediterranean sea": "(\"latitude\" BETWEEN 30 AND 46 AND \"longitude\" BETWEEN -6 AND 36)",
-    "north sea": "(\"latitude\" BETWEEN 51 AND 62 AND \"longitude\" BETWEEN -5 AND 10)",
-    "baltic sea": "(\"latitude\" BETWEEN 53 AND 66 AND \"longitude\" BETWEEN 10 AND 30)",
-    "black sea": "(\"latitude\" BETWEEN 40 AND 47 AND \"longitude\" BETWEEN 27 AND 42)",
-    "bay of biscay": "(\"latitude\" BETWEEN 43 AND 48 AND \"longitude\" BETWEEN -10 AND 0)",
+    "atlantic ocean": (-60, 60, -80, 0),
+    "north atlantic": (0, 60, -80, 0),
+    "south atlantic": (-60, 0, -70, 20),
+    "caribbean sea": (10, 22, -88, -60),
+    "gulf of mexico": (18, 30, -98, -80),
+    "mediterranean sea": (30, 46, -6, 36),
+    "north sea": (51, 62, -5, 10),
+    "baltic sea": (53, 66, 10, 30),
+    "black sea": (40, 47, 27, 42),
+    "bay of biscay": (43, 48, -10, 0),
     
     # ==========================================
     # INDIAN COASTAL CITIES - WEST COAST (North to South)
     # ==========================================
-    "kandla": "(\"latitude\" BETWEEN 22 AND 24 AND \"longitude\" BETWEEN 69 AND 71)",
-    "porbandar": "(\"latitude\" BETWEEN 21 AND 22.5 AND \"longitude\" BETWEEN 69 AND 70.5)",
-    "veraval": "(\"latitude\" BETWEEN 20 AND 21.5 AND \"longitude\" BETWEEN 69 AND 71)",
-    "diu": "(\"latitude\" BETWEEN 20 AND 21 AND \"longitude\" BETWEEN 70 AND 71.5)",
-    "surat": "(\"latitude\" BETWEEN 20 AND 22 AND \"longitude\" BETWEEN 71 AND 73)",
-    "daman": "(\"latitude\" BETWEEN 20 AND 21 AND \"longitude\" BETWEEN 72 AND 73.5)",
-    "mumbai": "(\"latitude\" BETWEEN 18 AND 20 AND \"longitude\" BETWEEN 71 AND 74)",
-    "bombay": "(\"latitude\" BETWEEN 18 AND 20 AND \"longitude\" BETWEEN 71 AND 74)",
-    "alibag": "(\"latitude\" BETWEEN 18 AND 19 AND \"longitude\" BETWEEN 72 AND 73.5)",
-    "ratnagiri": "(\"latitude\" BETWEEN 16 AND 17.5 AND \"longitude\" BETWEEN 72 AND 74)",
-    "rajapur": "(\"latitude\" BETWEEN 16 AND 17 AND \"longitude\" BETWEEN 73 AND 74)",
-    "goa": "(\"latitude\" BETWEEN 14 AND 16 AND \"longitude\" BETWEEN 72 AND 74)",
-    "panaji": "(\"latitude\" BETWEEN 15 AND 16 AND \"longitude\" BETWEEN 73 AND 74.5)",
-    "karwar": "(\"latitude\" BETWEEN 14 AND 15.5 AND \"longitude\" BETWEEN 73 AND 75)",
-    "mangalore": "(\"latitude\" BETWEEN 12 AND 14 AND \"longitude\" BETWEEN 74 AND 76)",
-    "mangaluru": "(\"latitude\" BETWEEN 12 AND 14 AND \"longitude\" BETWEEN 74 AND 76)",
-    "udupi": "(\"latitude\" BETWEEN 13 AND 14 AND \"longitude\" BETWEEN 74 AND 75.5)",
-    "kasaragod": "(\"latitude\" BETWEEN 12 AND 13 AND \"longitude\" BETWEEN 74 AND 75.5)",
-    "kannur": "(\"latitude\" BETWEEN 11 AND 12.5 AND \"longitude\" BETWEEN 74 AND 76)",
-    "cannanore": "(\"latitude\" BETWEEN 11 AND 12.5 AND \"longitude\" BETWEEN 74 AND 76)",
-    "kozhikode": "(\"latitude\" BETWEEN 11 AND 12 AND \"longitude\" BETWEEN 75 AND 76.5)",
-    "calicut": "(\"latitude\" BETWEEN 11 AND 12 AND \"longitude\" BETWEEN 75 AND 76.5)",
-    "beypore": "(\"latitude\" BETWEEN 11 AND 11.5 AND \"longitude\" BETWEEN 75 AND 76)",
-    "ponnani": "(\"latitude\" BETWEEN 10.5 AND 11 AND \"longitude\" BETWEEN 75 AND 76.5)",
-    "thrissur": "(\"latitude\" BETWEEN 10 AND 11 AND \"longitude\" BETWEEN 75 AND 77)",
-    "kochi": "(\"latitude\" BETWEEN 9 AND 11 AND \"longitude\" BETWEEN 75 AND 77)",
-    "cochin": "(\"latitude\" BETWEEN 9 AND 11 AND \"longitude\" BETWEEN 75 AND 77)",
-    "alappuzha": "(\"latitude\" BETWEEN 9 AND 10 AND \"longitude\" BETWEEN 76 AND 77)",
-    "alleppey": "(\"latitude\" BETWEEN 9 AND 10 AND \"longitude\" BETWEEN 76 AND 77)",
-    "kollam": "(\"latitude\" BETWEEN 8 AND 10 AND \"longitude\" BETWEEN 75 AND 77)",
-    "quilon": "(\"latitude\" BETWEEN 8 AND 10 AND \"longitude\" BETWEEN 75 AND 77)",
-    "varkala": "(\"latitude\" BETWEEN 8.5 AND 9 AND \"longitude\" BETWEEN 76 AND 77)",
-    "trivandrum": "(\"latitude\" BETWEEN 8 AND 9.5 AND \"longitude\" BETWEEN 76 AND 77.5)",
-    "thiruvananthapuram": "(\"latitude\" BETWEEN 8 AND 9.5 AND \"longitude\" BETWEEN 76 AND 77.5)",
-    "kovalam": "(\"latitude\" BETWEEN 8 AND 8.5 AND \"longitude\" BETWEEN 76 AND 77.5)",
-    "kanyakumari": "(\"latitude\" BETWEEN 7.5 AND 8.5 AND \"longitude\" BETWEEN 77 AND 78)",
-    "cape comorin": "(\"latitude\" BETWEEN 7.5 AND 8.5 AND \"longitude\" BETWEEN 77 AND 78)",
+    "kandla": (22, 24, 69, 71),
+    "porbandar": (21, 22.5, 69, 70.5),
+    "veraval": (20, 21.5, 69, 71),
+    "diu": (20, 21, 70, 71.5),
+    "surat": (20, 22, 71, 73),
+    "daman": (20, 21, 72, 73.5),
+    "mumbai": (18, 20, 71, 74),
+    "bombay": (18, 20, 71, 74),
+    "alibag": (18, 19, 72, 73.5),
+    "ratnagiri": (16, 17.5, 72, 74),
+    "rajapur": (16, 17, 73, 74),
+    "goa": (14, 16, 72, 74),
+    "panaji": (15, 16, 73, 74.5),
+    "karwar": (14, 15.5, 73, 75),
+    "mangalore": (12, 14, 74, 76),
+    "mangaluru": (12, 14, 74, 76),
+    "udupi": (13, 14, 74, 75.5),
+    "kasaragod": (12, 13, 74, 75.5),
+    "kannur": (11, 12.5, 74, 76),
+    "cannanore": (11, 12.5, 74, 76),
+    "kozhikode": (11, 12, 75, 76.5),
+    "calicut": (11, 12, 75, 76.5),
+    "beypore": (11, 11.5, 75, 76),
+    "ponnani": (10.5, 11, 75, 76.5),
+    "thrissur": (10, 11, 75, 77),
+    "kochi": (9, 11, 75, 77),
+    "cochin": (9, 11, 75, 77),
+    "alappuzha": (9, 10, 76, 77),
+    "alleppey": (9, 10, 76, 77),
+    "kollam": (8, 10, 75, 77),
+    "quilon": (8, 10, 75, 77),
+    "varkala": (8.5, 9, 76, 77),
+    "trivandrum": (8, 9.5, 76, 77.5),
+    "thiruvananthapuram": (8, 9.5, 76, 77.5),
+    "kovalam": (8, 8.5, 76, 77.5),
+    "kanyakumari": (7.5, 8.5, 77, 78),
+    "cape comorin": (7.5, 8.5, 77, 78),
     
     # ==========================================
     # INDIAN COASTAL CITIES - EAST COAST (South to North)
     # ==========================================
-    "rameswaram": "(\"latitude\" BETWEEN 9 AND 10 AND \"longitude\" BETWEEN 78 AND 80)",
-    "tuticorin": "(\"latitude\" BETWEEN 8 AND 9.5 AND \"longitude\" BETWEEN 77 AND 79)",
-    "thoothukudi": "(\"latitude\" BETWEEN 8 AND 9.5 AND \"longitude\" BETWEEN 77 AND 79)",
-    "nagapattinam": "(\"latitude\" BETWEEN 10 AND 11 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "karaikal": "(\"latitude\" BETWEEN 10.5 AND 11 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "cuddalore": "(\"latitude\" BETWEEN 11 AND 12 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "pondicherry": "(\"latitude\" BETWEEN 11 AND 12.5 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "puducherry": "(\"latitude\" BETWEEN 11 AND 12.5 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "mahabalipuram": "(\"latitude\" BETWEEN 12 AND 12.8 AND \"longitude\" BETWEEN 80 AND 81)",
-    "chennai": "(\"latitude\" BETWEEN 12 AND 14 AND \"longitude\" BETWEEN 79 AND 82)",
-    "madras": "(\"latitude\" BETWEEN 12 AND 14 AND \"longitude\" BETWEEN 79 AND 82)",
-    "ennore": "(\"latitude\" BETWEEN 13 AND 13.5 AND \"longitude\" BETWEEN 80 AND 81)",
-    "pulicat": "(\"latitude\" BETWEEN 13 AND 14 AND \"longitude\" BETWEEN 80 AND 81)",
-    "nellore": "(\"latitude\" BETWEEN 14 AND 15 AND \"longitude\" BETWEEN 79 AND 80.5)",
-    "machilipatnam": "(\"latitude\" BETWEEN 15 AND 16.5 AND \"longitude\" BETWEEN 80 AND 82)",
-    "kakinada": "(\"latitude\" BETWEEN 16 AND 17.5 AND \"longitude\" BETWEEN 82 AND 83.5)",
-    "visakhapatnam": "(\"latitude\" BETWEEN 17 AND 18.5 AND \"longitude\" BETWEEN 82 AND 84)",
-    "vizag": "(\"latitude\" BETWEEN 17 AND 18.5 AND \"longitude\" BETWEEN 82 AND 84)",
-    "bheemunipatnam": "(\"latitude\" BETWEEN 17.5 AND 18 AND \"longitude\" BETWEEN 83 AND 84)",
-    "gopalpur": "(\"latitude\" BETWEEN 19 AND 20 AND \"longitude\" BETWEEN 84 AND 85.5)",
-    "puri": "(\"latitude\" BETWEEN 19 AND 20.5 AND \"longitude\" BETWEEN 85 AND 86.5)",
-    "konark": "(\"latitude\" BETWEEN 19.5 AND 20 AND \"longitude\" BETWEEN 85 AND 87)",
-    "paradip": "(\"latitude\" BETWEEN 19 AND 21 AND \"longitude\" BETWEEN 86 AND 87.5)",
-    "dhamra": "(\"latitude\" BETWEEN 20 AND 21 AND \"longitude\" BETWEEN 86 AND 87.5)",
-    "chandipur": "(\"latitude\" BETWEEN 21 AND 22 AND \"longitude\" BETWEEN 86 AND 88)",
-    "digha": "(\"latitude\" BETWEEN 21 AND 22 AND \"longitude\" BETWEEN 87 AND 88.5)",
-    "haldia": "(\"latitude\" BETWEEN 21 AND 22.5 AND \"longitude\" BETWEEN 87 AND 88.5)",
-    "kolkata": "(\"latitude\" BETWEEN 21 AND 23 AND \"longitude\" BETWEEN 87 AND 89)",
-    "calcutta": "(\"latitude\" BETWEEN 21 AND 23 AND \"longitude\" BETWEEN 87 AND 89)",
-    "sundarbans": "(\"latitude\" BETWEEN 21 AND 23 AND \"longitude\" BETWEEN 88 AND 90)",
+    "rameswaram": (9, 10, 78, 80),
+    "tuticorin": (8, 9.5, 77, 79),
+    "thoothukudi": (8, 9.5, 77, 79),
+    "nagapattinam": (10, 11, 79, 80.5),
+    "karaikal": (10.5, 11, 79, 80.5),
+    "cuddalore": (11, 12, 79, 80.5),
+    "pondicherry": (11, 12.5, 79, 80.5),
+    "puducherry": (11, 12.5, 79, 80.5),
+    "mahabalipuram": (12, 12.8, 80, 81),
+    "chennai": (12, 14, 79, 82),
+    "madras": (12, 14, 79, 82),
+    "ennore": (13, 13.5, 80, 81),
+    "pulicat": (13, 14, 80, 81),
+    "nellore": (14, 15, 79, 80.5),
+    "machilipatnam": (15, 16.5, 80, 82),
+    "kakinada": (16, 17.5, 82, 83.5),
+    "visakhapatnam": (17, 18.5, 82, 84),
+    "vizag": (17, 18.5, 82, 84),
+    "bheemunipatnam": (17.5, 18, 83, 84),
+    "gopalpur": (19, 20, 84, 85.5),
+    "puri": (19, 20.5, 85, 86.5),
+    "konark": (19.5, 20, 85, 87),
+    "paradip": (19, 21, 86, 87.5),
+    "dhamra": (20, 21, 86, 87.5),
+    "chandipur": (21, 22, 86, 88),
+    "digha": (21, 22, 87, 88.5),
+    "haldia": (21, 22.5, 87, 88.5),
+    "kolkata": (21, 23, 87, 89),
+    "calcutta": (21, 23, 87, 89),
+    "sundarbans": (21, 23, 88, 90),
     
     # ==========================================
     # INDIAN ISLANDS
     # ==========================================
-    "andaman": "(\"latitude\" BETWEEN 6 AND 14 AND \"longitude\" BETWEEN 91 AND 95)",
-    "andaman islands": "(\"latitude\" BETWEEN 10 AND 14 AND \"longitude\" BETWEEN 91 AND 94)",
-    "nicobar islands": "(\"latitude\" BETWEEN 6 AND 10 AND \"longitude\" BETWEEN 92 AND 95)",
-    "port blair": "(\"latitude\" BETWEEN 11 AND 12.5 AND \"longitude\" BETWEEN 92 AND 93.5)",
-    "car nicobar": "(\"latitude\" BETWEEN 8.5 AND 10 AND \"longitude\" BETWEEN 92 AND 94)",
-    "lakshadweep": "(\"latitude\" BETWEEN 8 AND 14 AND \"longitude\" BETWEEN 71 AND 75)",
-    "kavaratti": "(\"latitude\" BETWEEN 10 AND 11 AND \"longitude\" BETWEEN 72 AND 73.5)",
-    "minicoy": "(\"latitude\" BETWEEN 8 AND 9 AND \"longitude\" BETWEEN 72 AND 74)",
+    "andaman": (6, 14, 91, 95),
+    "andaman islands": (10, 14, 91, 94),
+    "nicobar islands": (6, 10, 92, 95),
+    "port blair": (11, 12.5, 92, 93.5),
+    "car nicobar": (8.5, 10, 92, 94),
+    "lakshadweep": (8, 14, 71, 75),
+    "kavaratti": (10, 11, 72, 73.5),
+    "minicoy": (8, 9, 72, 74),
     
     # ==========================================
     # SOUTH ASIAN COUNTRIES
     # ==========================================
-    "sri lanka": "(\"latitude\" BETWEEN 5 AND 10 AND \"longitude\" BETWEEN 79 AND 82)",
-    "colombo": "(\"latitude\" BETWEEN 6 AND 8 AND \"longitude\" BETWEEN 79 AND 81)",
-    "trincomalee": "(\"latitude\" BETWEEN 8 AND 9.5 AND \"longitude\" BETWEEN 80 AND 82)",
-    "galle": "(\"latitude\" BETWEEN 5.5 AND 7 AND \"longitude\" BETWEEN 79 AND 81)",
-    "jaffna": "(\"latitude\" BETWEEN 9 AND 10 AND \"longitude\" BETWEEN 79 AND 81)",
-    "bangladesh": "(\"latitude\" BETWEEN 20 AND 26 AND \"longitude\" BETWEEN 88 AND 93)",
-    "chittagong": "(\"latitude\" BETWEEN 21 AND 23 AND \"longitude\" BETWEEN 91 AND 92.5)",
-    "cox bazar": "(\"latitude\" BETWEEN 21 AND 22 AND \"longitude\" BETWEEN 91 AND 92.5)",
-    "pakistan": "(\"latitude\" BETWEEN 23 AND 26 AND \"longitude\" BETWEEN 66 AND 70)",
-    "karachi": "(\"latitude\" BETWEEN 24 AND 25.5 AND \"longitude\" BETWEEN 66 AND 68)",
-    "gwadar": "(\"latitude\" BETWEEN 24 AND 26 AND \"longitude\" BETWEEN 61 AND 63)",
-    "maldives": "(\"latitude\" BETWEEN 0 AND 8 AND \"longitude\" BETWEEN 72 AND 74)",
-    "male": "(\"latitude\" BETWEEN 4 AND 5 AND \"longitude\" BETWEEN 73 AND 74)",
+    "sri lanka": (5, 10, 79, 82),
+    "colombo": (6, 8, 79, 81),
+    "trincomalee": (8, 9.5, 80, 82),
+    "galle": (5.5, 7, 79, 81),
+    "jaffna": (9, 10, 79, 81),
+    "bangladesh": (20, 26, 88, 93),
+    "chittagong": (21, 23, 91, 92.5),
+    "cox bazar": (21, 22, 91, 92.5),
+    "pakistan": (23, 26, 66, 70),
+    "karachi": (24, 25.5, 66, 68),
+    "gwadar": (24, 26, 61, 63),
+    "maldives": (0, 8, 72, 74),
+    "male": (4, 5, 73, 74),
     
     # ==========================================
     # SOUTHEAST ASIA
     # ==========================================
-    "myanmar": "(\"latitude\" BETWEEN 10 AND 20 AND \"longitude\" BETWEEN 92 AND 100)",
-    "yangon": "(\"latitude\" BETWEEN 16 AND 17.5 AND \"longitude\" BETWEEN 95 AND 97)",
-    "thailand": "(\"latitude\" BETWEEN 5 AND 15 AND \"longitude\" BETWEEN 97 AND 106)",
-    "phuket": "(\"latitude\" BETWEEN 7 AND 8.5 AND \"longitude\" BETWEEN 98 AND 99)",
-    "malaysia": "(\"latitude\" BETWEEN 1 AND 8 AND \"longitude\" BETWEEN 99 AND 120)",
-    "penang": "(\"latitude\" BETWEEN 5 AND 6 AND \"longitude\" BETWEEN 99 AND 101)",
-    "singapore": "(\"latitude\" BETWEEN 0 AND 3 AND \"longitude\" BETWEEN 103 AND 105)",
-    "indonesia": "(\"latitude\" BETWEEN -10 AND 6 AND \"longitude\" BETWEEN 95 AND 140)",
-    "jakarta": "(\"latitude\" BETWEEN -7 AND -5 AND \"longitude\" BETWEEN 106 AND 107.5)",
-    "bali": "(\"latitude\" BETWEEN -9 AND -8 AND \"longitude\" BETWEEN 114 AND 116)",
-    "vietnam": "(\"latitude\" BETWEEN 8 AND 23 AND \"longitude\" BETWEEN 102 AND 110)",
-    "philippines": "(\"latitude\" BETWEEN 5 AND 20 AND \"longitude\" BETWEEN 116 AND 127)",
-    "manila": "(\"latitude\" BETWEEN 14 AND 15 AND \"longitude\" BETWEEN 120 AND 121.5)",
+    "myanmar": (10, 20, 92, 100),
+    "yangon": (16, 17.5, 95, 97),
+    "thailand": (5, 15, 97, 106),
+    "phuket": (7, 8.5, 98, 99),
+    "malaysia": (1, 8, 99, 120),
+    "penang": (5, 6, 99, 101),
+    "singapore": (0, 3, 103, 105),
+    "indonesia": (-10, 6, 95, 140),
+    "jakarta": (-7, -5, 106, 107.5),
+    "bali": (-9, -8, 114, 116),
+    "vietnam": (8, 23, 102, 110),
+    "philippines": (5, 20, 116, 127),
+    "manila": (14, 15, 120, 121.5),
     
     # ==========================================
     # EAST ASIA
     # ==========================================
-    "china": "(\"latitude\" BETWEEN 18 AND 40 AND \"longitude\" BETWEEN 108 AND 125)",
-    "hong kong": "(\"latitude\" BETWEEN 22 AND 23 AND \"longitude\" BETWEEN 113 AND 115)",
-    "shanghai": "(\"latitude\" BETWEEN 30 AND 32 AND \"longitude\" BETWEEN 120 AND 123)",
-    "taiwan": "(\"latitude\" BETWEEN 21 AND 26 AND \"longitude\" BETWEEN 119 AND 122)",
-    "japan": "(\"latitude\" BETWEEN 24 AND 46 AND \"longitude\" BETWEEN 122 AND 146)",
-    "tokyo": "(\"latitude\" BETWEEN 34 AND 36 AND \"longitude\" BETWEEN 139 AND 141)",
-    "osaka": "(\"latitude\" BETWEEN 34 AND 35 AND \"longitude\" BETWEEN 135 AND 136)",
-    "korea": "(\"latitude\" BETWEEN 33 AND 43 AND \"longitude\" BETWEEN 124 AND 132)",
-    "busan": "(\"latitude\" BETWEEN 34 AND 36 AND \"longitude\" BETWEEN 128 AND 130)",
+    "china": (18, 40, 108, 125),
+    "hong kong": (22, 23, 113, 115),
+    "shanghai": (30, 32, 120, 123),
+    "taiwan": (21, 26, 119, 122),
+    "japan": (24, 46, 122, 146),
+    "tokyo": (34, 36, 139, 141),
+    "osaka": (34, 35, 135, 136),
+    "korea": (33, 43, 124, 132),
+    "busan": (34, 36, 128, 130),
     
     # ==========================================
     # MIDDLE EAST
     # ==========================================
-    "uae": "(\"latitude\" BETWEEN 22 AND 27 AND \"longitude\" BETWEEN 51 AND 57)",
-    "dubai": "(\"latitude\" BETWEEN 24 AND 26 AND \"longitude\" BETWEEN 54 AND 56)",
-    "abu dhabi": "(\"latitude\" BETWEEN 23 AND 25 AND \"longitude\" BETWEEN 53 AND 55)",
-    "oman": "(\"latitude\" BETWEEN 16 AND 26 AND \"longitude\" BETWEEN 52 AND 60)",
-    "muscat": "(\"latitude\" BETWEEN 23 AND 24.5 AND \"longitude\" BETWEEN 58 AND 60)",
-    "yemen": "(\"latitude\" BETWEEN 12 AND 19 AND \"longitude\" BETWEEN 42 AND 54)",
-    "aden": "(\"latitude\" BETWEEN 12 AND 13.5 AND \"longitude\" BETWEEN 44 AND 46)",
-    "saudi arabia": "(\"latitude\" BETWEEN 16 AND 32 AND \"longitude\" BETWEEN 34 AND 56)",
-    "jeddah": "(\"latitude\" BETWEEN 20 AND 22 AND \"longitude\" BETWEEN 38 AND 40)",
-    "qatar": "(\"latitude\" BETWEEN 24 AND 27 AND \"longitude\" BETWEEN 50 AND 52)",
-    "doha": "(\"latitude\" BETWEEN 25 AND 26 AND \"longitude\" BETWEEN 51 AND 52)",
-    "bahrain": "(\"latitude\" BETWEEN 25 AND 27 AND \"longitude\" BETWEEN 50 AND 51)",
-    "kuwait": "(\"latitude\" BETWEEN 28 AND 30 AND \"longitude\" BETWEEN 47 AND 49)",
+    "uae": (22, 27, 51, 57),
+    "dubai": (24, 26, 54, 56),
+    "abu dhabi": (23, 25, 53, 55),
+    "oman": (16, 26, 52, 60),
+    "muscat": (23, 24.5, 58, 60),
+    "yemen": (12, 19, 42, 54),
+    "aden": (12, 13.5, 44, 46),
+    "saudi arabia": (16, 32, 34, 56),
+    "jeddah": (20, 22, 38, 40),
+    "qatar": (24, 27, 50, 52),
+    "doha": (25, 26, 51, 52),
+    "bahrain": (25, 27, 50, 51),
+    "kuwait": (28, 30, 47, 49),
     
     # ==========================================
     # AFRICA
     # ==========================================
-    "egypt": "(\"latitude\" BETWEEN 22 AND 32 AND \"longitude\" BETWEEN 24 AND 37)",
-    "alexandria": "(\"latitude\" BETWEEN 31 AND 32 AND \"longitude\" BETWEEN 29 AND 30.5)",
-    "djibouti": "(\"latitude\" BETWEEN 10 AND 13 AND \"longitude\" BETWEEN 41 AND 44)",
-    "somalia": "(\"latitude\" BETWEEN -2 AND 12 AND \"longitude\" BETWEEN 40 AND 52)",
-    "kenya": "(\"latitude\" BETWEEN -5 AND 5 AND \"longitude\" BETWEEN 33 AND 42)",
-    "mombasa": "(\"latitude\" BETWEEN -5 AND -3 AND \"longitude\" BETWEEN 39 AND 41)",
-    "tanzania": "(\"latitude\" BETWEEN -12 AND -1 AND \"longitude\" BETWEEN 29 AND 41)",
-    "dar es salaam": "(\"latitude\" BETWEEN -7 AND -6 AND \"longitude\" BETWEEN 38 AND 40)",
-    "zanzibar": "(\"latitude\" BETWEEN -7 AND -5 AND \"longitude\" BETWEEN 39 AND 40)",
-    "mozambique": "(\"latitude\" BETWEEN -27 AND -10 AND \"longitude\" BETWEEN 30 AND 41)",
-    "madagascar": "(\"latitude\" BETWEEN -26 AND -12 AND \"longitude\" BETWEEN 43 AND 51)",
-    "mauritius": "(\"latitude\" BETWEEN -21 AND -19 AND \"longitude\" BETWEEN 56 AND 58)",
-    "seychelles": "(\"latitude\" BETWEEN -5 AND -4 AND \"longitude\" BETWEEN 55 AND 56)",
-    "south africa": "(\"latitude\" BETWEEN -35 AND -22 AND \"longitude\" BETWEEN 16 AND 33)",
-    "cape town": "(\"latitude\" BETWEEN -35 AND -33 AND \"longitude\" BETWEEN 17 AND 19)",
-    "durban": "(\"latitude\" BETWEEN -30 AND -29 AND \"longitude\" BETWEEN 30 AND 32)",
+    "egypt": (22, 32, 24, 37),
+    "alexandria": (31, 32, 29, 30.5),
+    "djibouti": (10, 13, 41, 44),
+    "somalia": (-2, 12, 40, 52),
+    "kenya": (-5, 5, 33, 42),
+    "mombasa": (-5, -3, 39, 41),
+    "tanzania": (-12, -1, 29, 41),
+    "dar es salaam": (-7, -6, 38, 40),
+    "zanzibar": (-7, -5, 39, 40),
+    "mozambique": (-27, -10, 30, 41),
+    "madagascar": (-26, -12, 43, 51),
+    "mauritius": (-21, -19, 56, 58),
+    "seychelles": (-5, -4, 55, 56),
+    "south africa": (-35, -22, 16, 33),
+    "cape town": (-35, -33, 17, 19),
+    "durban": (-30, -29, 30, 32),
     
     # ==========================================
     # EUROPE
     # ==========================================
-    "uk": "(\"latitude\" BETWEEN 49 AND 61 AND \"longitude\" BETWEEN -11 AND 2)",
-    "london": "(\"latitude\" BETWEEN 51 AND 52 AND \"longitude\" BETWEEN -1 AND 1)",
-    "france": "(\"latitude\" BETWEEN 41 AND 51 AND \"longitude\" BETWEEN -5 AND 10)",
-    "marseille": "(\"latitude\" BETWEEN 43 AND 44 AND \"longitude\" BETWEEN 5 AND 6)",
-    "spain": "(\"latitude\" BETWEEN 36 AND 44 AND \"longitude\" BETWEEN -10 AND 4)",
-    "barcelona": "(\"latitude\" BETWEEN 41 AND 42 AND \"longitude\" BETWEEN 1 AND 3)",
-    "portugal": "(\"latitude\" BETWEEN 36 AND 42 AND \"longitude\" BETWEEN -10 AND -6)",
-    "lisbon": "(\"latitude\" BETWEEN 38 AND 39 AND \"longitude\" BETWEEN -10 AND -8)",
-    "italy": "(\"latitude\" BETWEEN 36 AND 47 AND \"longitude\" BETWEEN 6 AND 19)",
-    "naples": "(\"latitude\" BETWEEN 40 AND 41 AND \"longitude\" BETWEEN 14 AND 15)",
-    "venice": "(\"latitude\" BETWEEN 45 AND 46 AND \"longitude\" BETWEEN 12 AND 13)",
-    "greece": "(\"latitude\" BETWEEN 34 AND 42 AND \"longitude\" BETWEEN 19 AND 30)",
-    "athens": "(\"latitude\" BETWEEN 37 AND 38 AND \"longitude\" BETWEEN 23 AND 24)",
-    "turkey": "(\"latitude\" BETWEEN 35 AND 42 AND \"longitude\" BETWEEN 26 AND 45)",
-    "istanbul": "(\"latitude\" BETWEEN 40 AND 42 AND \"longitude\" BETWEEN 28 AND 30)",
-    "germany": "(\"latitude\" BETWEEN 47 AND 55 AND \"longitude\" BETWEEN 5 AND 15)",
-    "netherlands": "(\"latitude\" BETWEEN 50 AND 54 AND \"longitude\" BETWEEN 3 AND 8)",
-    "rotterdam": "(\"latitude\" BETWEEN 51 AND 52 AND \"longitude\" BETWEEN 4 AND 5)",
-    "norway": "(\"latitude\" BETWEEN 57 AND 71 AND \"longitude\" BETWEEN 4 AND 31)",
-    "sweden": "(\"latitude\" BETWEEN 55 AND 69 AND \"longitude\" BETWEEN 10 AND 25)",
-    "denmark": "(\"latitude\" BETWEEN 54 AND 58 AND \"longitude\" BETWEEN 8 AND 16)",
+    "uk": (49, 61, -11, 2),
+    "london": (51, 52, -1, 1),
+    "france": (41, 51, -5, 10),
+    "marseille": (43, 44, 5, 6),
+    "spain": (36, 44, -10, 4),
+    "barcelona": (41, 42, 1, 3),
+    "portugal": (36, 42, -10, -6),
+    "lisbon": (38, 39, -10, -8),
+    "italy": (36, 47, 6, 19),
+    "naples": (40, 41, 14, 15),
+    "venice": (45, 46, 12, 13),
+    "greece": (34, 42, 19, 30),
+    "athens": (37, 38, 23, 24),
+    "turkey": (35, 42, 26, 45),
+    "istanbul": (40, 42, 28, 30),
+    "germany": (47, 55, 5, 15),
+    "netherlands": (50, 54, 3, 8),
+    "rotterdam": (51, 52, 4, 5),
+    "norway": (57, 71, 4, 31),
+    "sweden": (55, 69, 10, 25),
+    "denmark": (54, 58, 8, 16),
     
     # ==========================================
     # AMERICAS
     # ==========================================
-    "usa": "(\"latitude\" BETWEEN 24 AND 49 AND \"longitude\" BETWEEN -125 AND -66)",
-    "new york": "(\"latitude\" BETWEEN 40 AND 41.5 AND \"longitude\" BETWEEN -75 AND -73)",
-    "miami": "(\"latitude\" BETWEEN 25 AND 27 AND \"longitude\" BETWEEN -81 AND -79)",
-    "los angeles": "(\"latitude\" BETWEEN 33 AND 35 AND \"longitude\" BETWEEN -119 AND -117)",
-    "san francisco": "(\"latitude\" BETWEEN 37 AND 38.5 AND \"longitude\" BETWEEN -123 AND -121)",
-    "houston": "(\"latitude\" BETWEEN 29 AND 30.5 AND \"longitude\" BETWEEN -96 AND -94)",
-    "hawaii": "(\"latitude\" BETWEEN 18 AND 23 AND \"longitude\" BETWEEN -161 AND -154)",
-    "canada": "(\"latitude\" BETWEEN 41 AND 84 AND \"longitude\" BETWEEN -141 AND -52)",
-    "vancouver": "(\"latitude\" BETWEEN 49 AND 50 AND \"longitude\" BETWEEN -124 AND -122)",
-    "mexico": "(\"latitude\" BETWEEN 14 AND 33 AND \"longitude\" BETWEEN -118 AND -86)",
-    "cancun": "(\"latitude\" BETWEEN 21 AND 22 AND \"longitude\" BETWEEN -87 AND -86)",
-    "brazil": "(\"latitude\" BETWEEN -34 AND 5 AND \"longitude\" BETWEEN -74 AND -34)",
-    "rio de janeiro": "(\"latitude\" BETWEEN -23.5 AND -22 AND \"longitude\" BETWEEN -44 AND -42)",
-    "argentina": "(\"latitude\" BETWEEN -55 AND -21 AND \"longitude\" BETWEEN -74 AND -53)",
-    "buenos aires": "(\"latitude\" BETWEEN -35 AND -34 AND \"longitude\" BETWEEN -59 AND -57)",
-    "chile": "(\"latitude\" BETWEEN -56 AND -17 AND \"longitude\" BETWEEN -76 AND -66)",
-    "peru": "(\"latitude\" BETWEEN -19 AND 0 AND \"longitude\" BETWEEN -82 AND -68)",
-    "colombia": "(\"latitude\" BETWEEN -5 AND 14 AND \"longitude\" BETWEEN -80 AND -66)",
-    "panama": "(\"latitude\" BETWEEN 7 AND 10 AND \"longitude\" BETWEEN -83 AND -77)",
-    "cuba": "(\"latitude\" BETWEEN 19 AND 24 AND \"longitude\" BETWEEN -85 AND -74)",
-    "bahamas": "(\"latitude\" BETWEEN 20 AND 27 AND \"longitude\" BETWEEN -80 AND -72)",
+    "usa": (24, 49, -125, -66),
+    "new york": (40, 41.5, -75, -73),
+    "miami": (25, 27, -81, -79),
+    "los angeles": (33, 35, -119, -117),
+    "san francisco": (37, 38.5, -123, -121),
+    "houston": (29, 30.5, -96, -94),
+    "hawaii": (18, 23, -161, -154),
+    "canada": (41, 84, -141, -52),
+    "vancouver": (49, 50, -124, -122),
+    "mexico": (14, 33, -118, -86),
+    "cancun": (21, 22, -87, -86),
+    "brazil": (-34, 5, -74, -34),
+    "rio de janeiro": (-23.5, -22, -44, -42),
+    "argentina": (-55, -21, -74, -53),
+    "buenos aires": (-35, -34, -59, -57),
+    "chile": (-56, -17, -76, -66),
+    "peru": (-19, 0, -82, -68),
+    "colombia": (-5, 14, -80, -66),
+    "panama": (7, 10, -83, -77),
+    "cuba": (19, 24, -85, -74),
+    "bahamas": (20, 27, -80, -72),
     
     # ==========================================
     # OCEANIA
     # ==========================================
-    "australia": "(\"latitude\" BETWEEN -44 AND -10 AND \"longitude\" BETWEEN 113 AND 154)",
-    "sydney": "(\"latitude\" BETWEEN -35 AND -33 AND \"longitude\" BETWEEN 150 AND 152)",
-    "melbourne": "(\"latitude\" BETWEEN -38.5 AND -37 AND \"longitude\" BETWEEN 144 AND 146)",
-    "brisbane": "(\"latitude\" BETWEEN -28 AND -27 AND \"longitude\" BETWEEN 152 AND 154)",
-    "perth": "(\"latitude\" BETWEEN -33 AND -31 AND \"longitude\" BETWEEN 115 AND 117)",
-    "darwin": "(\"latitude\" BETWEEN -13 AND -11 AND \"longitude\" BETWEEN 130 AND 132)",
-    "great barrier reef": "(\"latitude\" BETWEEN -25 AND -10 AND \"longitude\" BETWEEN 142 AND 155)",
-    "new zealand": "(\"latitude\" BETWEEN -47 AND -34 AND \"longitude\" BETWEEN 166 AND 179)",
-    "auckland": "(\"latitude\" BETWEEN -37.5 AND -36 AND \"longitude\" BETWEEN 174 AND 175.5)",
-    "fiji": "(\"latitude\" BETWEEN -21 AND -16 AND \"longitude\" BETWEEN 177 AND -179)",
-    "papua new guinea": "(\"latitude\" BETWEEN -12 AND -1 AND \"longitude\" BETWEEN 140 AND 156)",
+    "australia": (-44, -10, 113, 154),
+    "sydney": (-35, -33, 150, 152),
+    "melbourne": (-38.5, -37, 144, 146),
+    "brisbane": (-28, -27, 152, 154),
+    "perth": (-33, -31, 115, 117),
+    "darwin": (-13, -11, 130, 132),
+    "great barrier reef": (-25, -10, 142, 155),
+    "new zealand": (-47, -34, 166, 179),
+    "auckland": (-37.5, -36, 174, 175.5),
+    "fiji": (-21, -16, 177, -179),
+    "papua new guinea": (-12, -1, 140, 156),
     
     # ==========================================
     # SPECIAL REGIONS
     # ==========================================
-    "equator": "(\"latitude\" BETWEEN -2 AND 2)",
-    "tropics": "(\"latitude\" BETWEEN -23.5 AND 23.5)",
-    "arctic": "(\"latitude\" BETWEEN 66 AND 90)",
-    "antarctic": "(\"latitude\" BETWEEN -90 AND -66)",
-    "southern ocean": "(\"latitude\" BETWEEN -65 AND -40)",
-    "north pole": "(\"latitude\" BETWEEN 85 AND 90)",
-    "south pole": "(\"latitude\" BETWEEN -90 AND -85)"
+    "equator": (-2, 2, -180, 180),
+    "tropics": (-23.5, 23.5, -180, 180),
+    "arctic": (66, 90, -180, 180),
+    "antarctic": (-90, -66, -180, 180),
+    "southern ocean": (-65, -40, -180, 180),
+    "north pole": (85, 90, -180, 180),
+    "south pole": (-90, -85, -180, 180)
 }
 
+def _bounds_clause(bounds):
+    """Render (lat_min, lat_max, lon_min, lon_max) as the SQL filter used by sql_builder."""
+    lat_min, lat_max, lon_min, lon_max = bounds
+    if lon_min <= -180 and lon_max >= 180:
+        return f'("latitude" BETWEEN {lat_min} AND {lat_max})'
+    return f'("latitude" BETWEEN {lat_min} AND {lat_max} AND "longitude" BETWEEN {lon_min} AND {lon_max})'
+
+# SQL snippets are derived from the numeric bounds, never hand-written
+LOCATIONS = {name: _bounds_clause(bounds) for name, bounds in LOCATION_BOUNDS.items()}
+_VALID_LOCATIONS_TEXT = ', '.join(LOCATIONS)
+
+# Structure-of-arrays view for vectorized point-in-region lookups
+_LOC_NAMES = np.array(list(LOCATION_BOUNDS.keys()))
+_LOC_BOX = np.array(list(LOCATION_BOUNDS.values()), dtype=np.float64)  # (N, 4)
+_LOC_AREA = (_LOC_BOX[:, 1] - _LOC_BOX[:, 0]) * (_LOC_BOX[:, 3] - _LOC_BOX[:, 2])
+
+def locations_containing(lat, lon):
+    """Names of all supported regions whose box contains (lat, lon), smallest first."""
+    mask = ((lat >= _LOC_BOX[:, 0]) & (lat <= _LOC_BOX[:, 1]) &
+            (lon >= _LOC_BOX[:, 2]) & (lon <= _LOC_BOX[:, 3]))
+    idx = np.flatnonzero(mask)
+    return _LOC_NAMES[idx[np.argsort(_LOC_AREA[idx])]].tolist()
+
+# Whole-word matcher over every supported location name (longest first)
+_LOCATION_NAME_RE = re.compile(r'\b(?:' + _keyword_re(LOCATION_BOUNDS).pattern + r')\b')
+
+def find_location_name(question_lower):
+    """Longest supported location name mentioned in the question, or None."""
+    hits = _LOCATION_NAME_RE.findall(question_lower)
+    return max(hits, key=len) if hits else None
+
 # Cache for database context with TTL - OPTIMIZED
+# argo_data column names (schema is static at runtime)
+_argo_columns_cache = None
+_argo_columns_timestamp = None
+ARGO_COLUMNS_TTL = 3600
+
+def get_argo_columns(engine, force_refresh=False):
+    """Column names of argo_data as a frozenset, cached for ARGO_COLUMNS_TTL seconds."""
+    global _argo_columns_cache, _argo_columns_timestamp
+    if (not force_refresh and _argo_columns_cache and _argo_columns_timestamp
+            and time.time() - _argo_columns_timestamp < ARGO_COLUMNS_TTL):
+        return _argo_columns_cache
+    with engine.connect() as connection:
+        insp = connection.execute(text("SELECT column_name FROM information_schema.columns WHERE table_name = 'argo_data';"))
+        columns = frozenset(row[0] for row in insp)
+    if columns:  # don't pin an empty result while the table is being created
+        if columns != _argo_columns_cache:
+            with _intent_cache_lock:
+                _intent_cache.clear()  # memoized intents were sanitized against the old schema
+        _argo_columns_cache = columns
+        _argo_columns_timestamp = time.time()
+    return columns
+
+def argo_columns_future(engine):
+    """
+    get_argo_columns as a Future: already resolved while the cache is fresh,
+    otherwise fetched on _io_pool so the query overlaps other work (the LLM call).
+    """
+    if _argo_columns_cache and _argo_columns_timestamp and time.time() - _argo_columns_timestamp < ARGO_COLUMNS_TTL:
+        future = Future()
+        future.set_result(_argo_columns_cache)
+        return future
+    return _io_pool.submit(get_argo_columns, engine)
+
 _db_context_cache = None
 _db_context_timestamp = None
 DB_CONTEXT_TTL = 600  # Cache for 10 minutes (data doesn't change frequently)
+DB_CONTEXT_REFRESH_INTERVAL = 300  # Background refresh keeps requests off the slow path
+_context_refresher_pid = None
+_context_refresher_lock = threading.Lock()
+
+def _context_refresh_loop(warm):
+    if not warm:
+        time.sleep(DB_CONTEXT_REFRESH_INTERVAL)
+    while True:
+        try:
+            get_database_context(get_engine(), force_refresh=True)
+        except Exception as e:
+            print(f"⚠️ Background context refresh failed: {e}")
+        time.sleep(DB_CONTEXT_REFRESH_INTERVAL)
 
-def get_database_context(engine):
+def start_context_refresher(warm=True):
+    """
+    Start the daemon thread that keeps the DB context fresh (once per process,
+    so it is safe to call after a gunicorn fork). warm=True loads it right away.
+    """
+    global _context_refresher_pid
+    with _context_refresher_lock:
+        if _context_refresher_pid == os.getpid():
+            return
+        _context_refresher_pid = os.getpid()
+    threading.Thread(target=_context_refresh_loop, args=(warm,), daemon=True, name="db-context-refresh").start()
+
+def get_database_context(engine, force_refresh=False):
     global db_context, _db_context_cache, _db_context_timestamp
+    start_context_refresher(warm=False)
     
     # Check if cached context is still valid (10-minute TTL for deployed performance)
-    if _db_context_cache and _db_context_timestamp:
+    if not force_refresh and _db_context_cache and _db_context_timestamp:
         elapsed = time.time() - _db_context_timestamp
         if elapsed < DB_CONTEXT_TTL:
             # Silent cache hit for cleaner logs in production
@@ -705,72 +1259,54 @@ def get_database_context(engine):
             print(f"[DB] Context refreshed: {db_context['min_date']} to {db_context['max_date']}")
             return db_context
     except Exception as e:
-        print(f"CRITICAL ERROR: Could not get database context. {e}"); return None
-
-INTENT_PARSER_PROMPT = """You are an expert oceanographic data analyst AI. Your task is to parse the user's natural language question into a structured JSON object for SQL query generation.
-
-## DATABASE SCHEMA
-Table: argo_data
-Columns: float_id (int), timestamp (datetime), latitude (float), longitude (float), pressure (float), temperature (float), salinity (float), dissolved_oxygen (float), chlorophyll (float)
-
-## SUPPORTED QUERY TYPES (choose the most appropriate):
-1. "Statistic" - For aggregations: averages, max/min, counts, sums
-   Examples: "average temperature", "how many floats", "maximum salinity", "count of records"
-   
-2. "Proximity" - Finding floats/data near a geographic location
-   Examples: "floats near Chennai", "nearest to Bay of Bengal", "data within 100km of Mumbai"
-   
-3. "Trajectory" - Path/movement tracking of a specific float over time
-   Examples: "trajectory of float 2902115", "path of float 2901234", "where did float X travel"
-   
-4. "Profile" - Vertical depth profile data (measurements at different depths)
-   Examples: "depth profile", "temperature vs pressure", "vertical profile of salinity"
-   
-5. "Time-Series" - Data changes over time periods
-   Examples: "temperature trend in 2024", "salinity from January to March", "monthly averages"
-   
-6. "Scatter" - Comparing relationships between two variables
-   Examples: "temperature vs salinity", "correlation between oxygen and depth"
-   
-7. "General" - Default for exploration or unclear queries
-
-## SUPPORTED LOCATIONS (use exact names):
-**Indian Ocean:** arabian sea, bay of bengal, indian ocean, andaman sea, laccadive sea, red sea, persian gulf, mozambique channel
-**Pacific Ocean:** pacific ocean, south china sea, philippine sea, coral sea, tasman sea
-**Atlantic Ocean:** atlantic ocean, caribbean sea, gulf of mexico, mediterranean sea, north sea
-**Indian Cities:** chennai, mumbai, kollam, kochi, cochin, goa, kolkata, visakhapatnam, vizag, mangalore, tuticorin, pondicherry, puducherry, trivandrum, thiruvananthapuram, surat, kandla, paradip, andaman, port blair, karwar, ratnagiri
-**International:** sri lanka, singapore, tokyo, sydney, cape town, miami, maldives, mauritius
-**Special Regions:** equator, tropics, southern ocean
-
-## FIELDS TO EXTRACT:
-- "query_type": One of the 7 types above (REQUIRED)
-- "metrics": Array of measurements needed: ["temperature", "salinity", "dissolved_oxygen", "pressure", "chlorophyll"]
-- "location_name": Geographic location name (lowercase, from supported list)
-- "latitude": Numeric latitude if explicitly mentioned (-90 to 90)
-- "longitude": Numeric longitude if explicitly mentioned (-180 to 180)
-- "time_constraint": Time period string (e.g., "2024", "March 2024", "from 2023 to 2024", "last 6 months")
-- "year": Specific year as integer (2020-2026)
-- "month": Specific month as integer (1-12)
-- "distance_km": Search radius in kilometers for proximity queries (default: 500)
-- "aggregation": For statistics - "avg", "max", "min", "count", or "sum"
-- "float_id": Integer float ID if mentioned (e.g., 2902115)
-- "limit": Number of results to return (default: 10 for lists, 500 for data)
-- "group_by": Field to group results by (e.g., "month", "float_id")
-
-## USER QUESTION:
-"{question}"
-
-## INSTRUCTIONS:
-1. Analyze the question carefully to determine the correct query_type
-2. Extract ALL relevant parameters mentioned
-3. Use lowercase for location_name
-4. For "nearest" or "near" queries, always use query_type "Proximity"
-5. For "float X" or "float ID X", extract the float_id as integer
-6. If no specific metrics mentioned, include relevant ones based on context
-7. Return ONLY a valid JSON object - no explanations, no markdown
-
-## OUTPUT FORMAT:
-Return a single JSON object with the extracted fields. Omit fields that don't apply.
+        print(f"CRITICAL ERROR: Could not get database context. {e}")
+        # Serve the last known (stale) context rather than failing the request
+        return _db_context_cache
+
+# Cache for "available floats" suggestions, keyed by the WHERE clause
+_float_list_cache = {}
+FLOAT_LIST_TTL = 300  # 5 minutes
+FLOAT_LIST_CACHE_MAX = 512
+# Request threads share these module caches; the lock keeps the oldest-entry
+# eviction from racing another thread's insert (same for the caches below)
+_float_list_lock = threading.Lock()
+
+def _get_cached_float_list(where_sql):
+    with _float_list_lock:
+        entry = _float_list_cache.get(where_sql)
+    if entry and time.time() - entry[1] < FLOAT_LIST_TTL:
+        return entry[0]
+    return None
+
+def _set_cached_float_list(where_sql, floats):
+    """Store (records, float_ids) for a WHERE clause."""
+    with _float_list_lock:
+        if len(_float_list_cache) >= FLOAT_LIST_CACHE_MAX:
+            # Drop the oldest entry (dicts keep insertion order)
+            _float_list_cache.pop(next(iter(_float_list_cache)), None)
+        _float_list_cache[where_sql] = (floats, time.time())
+
+INTENT_PARSER_PROMPT = """Parse the user's ocean-data question into a JSON object for SQL generation.
+
+Table argo_data: float_id (int), timestamp, latitude, longitude, pressure, temperature, salinity, dissolved_oxygen, chlorophyll
+
+## query_type (pick one)
+- "Statistic": avg/max/min/count/sum ("average temperature", "how many floats")
+- "Proximity": data near a place or point ("floats near Chennai", "within 100km of Mumbai")
+- "Trajectory": path of one float over time ("trajectory of float 2902115")
+- "Profile": values by depth ("temperature vs pressure", "depth profile")
+- "Time-Series": change over time ("monthly salinity in 2024")
+- "Scatter": relation of two variables ("temperature vs salinity")
+- "General": anything else
+
+## Fields (omit those that don't apply)
+query_type (required); metrics (array of temperature, salinity, dissolved_oxygen, pressure, chlorophyll); location_name (lowercase); latitude (-90..90); longitude (-180..180); time_constraint (e.g. "2024", "March 2024", "last 6 months"); year (int); month (1-12); distance_km (default 500); aggregation (avg, max, min, count, sum); float_id (int); limit (default 10 for lists, 500 for data); group_by (e.g. "month", "float_id")
+
+Likely location (matched server-side, use as location_name unless the question says otherwise): {location_hint}
+
+Question: "{question}"
+
+Rules: "near"/"nearest" means Proximity; "float X" sets float_id; if no metric is named pick relevant ones. Return ONLY the JSON object.
 
 JSON:"""
 
@@ -780,7 +1316,7 @@ SUMMARIZATION_PROMPT = """You are an expert oceanographic analyst. Provide clear
 Query: {question}
 Type: {query_type}
 Stats: {results_summary}
-Sample: {sample_data}
+Sample (columnar, {{column: [first 5 values]}}): {sample_data}
 
 ## RESPONSE RULES
 1. Be DIRECT and CONCISE - 2-3 sentences max
@@ -812,39 +1348,32 @@ For NO DATA:
 
 ## YOUR RESPONSE (direct, professional, data-first):"""
 
+# Templates are parsed once; chains per provider are cached by get_chain()
+_PROMPTS = {
+    "intent": PromptTemplate.from_template(INTENT_PARSER_PROMPT),
+    "summary": PromptTemplate.from_template(SUMMARIZATION_PROMPT),
+}
+
 
 # ------------------------------------------------------------------
 # Conversational Handler - Handle greetings and simple messages
 # ------------------------------------------------------------------
 
-def handle_conversational_query(question: str):
+def handle_conversational_query(question: str, analysis: dict = None):
     """
     Handle simple conversational queries that don't need database access.
     Returns a response dict if it's a conversational query, None otherwise.
     """
-    question_lower = question.strip().lower()
-    question_clean = re.sub(r'[^\w\s]', '', question_lower)  # Remove punctuation
+    trivial = _trivial_reply(question)
+    if trivial is not None:
+        return trivial
     
-    # Greeting patterns
-    greetings = ['hello', 'hi', 'hey', 'hola', 'greetings', 'good morning', 'good afternoon', 
-                 'good evening', 'howdy', 'sup', 'whats up', "what's up", 'yo']
-    
-    # Help/info patterns
-    help_patterns = ['help', 'what can you do', 'how do i use', 'how does this work',
-                     'what is this', 'capabilities', 'features', 'commands']
-    
-    # About patterns
-    about_patterns = ['who are you', 'what are you', 'tell me about yourself', 
-                      'introduce yourself', 'your name']
-    
-    # Thanks patterns
-    thanks_patterns = ['thank', 'thanks', 'thx', 'appreciate', 'grateful']
-    
-    # Goodbye patterns
-    bye_patterns = ['bye', 'goodbye', 'see you', 'later', 'cya', 'take care']
+    analysis = analysis or analyze_question(question)
+    tags = analysis["tags"]
+    word_count = len(analysis["words"])
     
     # Check greetings
-    if any(greet in question_clean for greet in greetings) and len(question_clean.split()) <= 5:
+    if "greeting" in tags and word_count <= 5:
         return {
             "query_type": "Conversation",
             "summary": "Welcome to FloatChart! I analyze ARGO oceanographic data worldwide.\n\n**Quick queries you can try:**\n• `floats near Chennai` - Find nearby ARGO floats\n• `temperature in Bay of Bengal` - Get statistics\n• `trajectory of float 2902115` - Track float movement\n• `salinity near Kannur 2024` - Regional data\n\nSupported locations: All Indian coastal cities, major ports worldwide, ocean basins.",
@@ -853,7 +1382,7 @@ def handle_conversational_query(question: str):
         }
     
     # Check help requests
-    if any(help_word in question_clean for help_word in help_patterns):
+    if "help" in tags:
         return {
             "query_type": "Conversation",
             "summary": """**FloatChart Commands:**
@@ -881,7 +1410,7 @@ def handle_conversational_query(question: str):
         }
     
     # Check about/identity
-    if any(about in question_clean for about in about_patterns):
+    if "about" in tags:
         return {
             "query_type": "Conversation",
             "summary": "**FloatChart** - Ocean Data Intelligence Platform\n\nI query 46M+ ARGO float measurements covering global oceans. Capabilities: proximity search, statistics, trajectory tracking, depth profiles, time-series analysis.\n\nData source: Global ARGO network (autonomous profiling floats measuring temperature, salinity, and other ocean parameters).",
@@ -890,7 +1419,7 @@ def handle_conversational_query(question: str):
         }
     
     # Check thanks
-    if any(thank in question_clean for thank in thanks_patterns) and len(question_clean.split()) <= 6:
+    if "thanks" in tags and word_count <= 6:
         return {
             "query_type": "Conversation",
             "summary": "You're welcome! 😊 Feel free to ask more questions about ocean data anytime. Happy exploring! 🌊",
@@ -899,7 +1428,7 @@ def handle_conversational_query(question: str):
         }
     
     # Check goodbye
-    if any(bye in question_clean for bye in bye_patterns) and len(question_clean.split()) <= 5:
+    if "bye" in tags and word_count <= 5:
         return {
             "query_type": "Conversation",
             "summary": "Goodbye! 👋 Thanks for exploring the ocean with FloatChart. Come back anytime to dive into more data! 🌊🐠",
@@ -911,6 +1440,24 @@ def handle_conversational_query(question: str):
     return None
 
 
+# Exact-match replies for the most common one-liners ("hi", "thanks", "bye", ...)
+_TRIVIAL_REPLIES = {}
+
+def _trivial_reply(question: str):
+    """O(1) lookup in _TRIVIAL_REPLIES; returns a copy or None."""
+    reply = _TRIVIAL_REPLIES.get(question.strip().lower().rstrip("!?. "))
+    return dict(reply) if reply is not None else None
+
+# Precompute with the regular handler so the fast path can never disagree with it
+for _phrase in ("hi", "hello", "hey", "hola", "howdy", "yo", "sup", "hi there", "hello there",
+                "good morning", "good afternoon", "good evening", "help",
+                "thanks", "thank you", "thx", "thanks a lot", "bye", "goodbye", "cya", "see you"):
+    _reply = handle_conversational_query(_phrase)
+    if _reply is not None:
+        _TRIVIAL_REPLIES[_phrase] = _reply
+del _phrase, _reply
+
+
 # ========================================
 # PROFESSIONAL OUTPUT SYSTEM
 # ========================================
@@ -1073,11 +1620,18 @@ def _trajectory_insights(df, data_records, intent, insights):
             df_sorted = df.sort_values('timestamp') if 'timestamp' in df.columns else df
             
             # Calculate total distance traveled
-            total_distance = 0
-            for i in range(1, len(df_sorted)):
-                lat1, lon1 = df_sorted.iloc[i-1]['latitude'], df_sorted.iloc[i-1]['longitude']
-                lat2, lon2 = df_sorted.iloc[i]['latitude'], df_sorted.iloc[i]['longitude']
-                total_distance += _haversine_distance(lat1, lon1, lat2, lon2)
+            lats = df_sorted['latitude'].to_numpy(dtype=float)
+            lons = df_sorted['longitude'].to_numpy(dtype=float)
+            # Skip fixes with a missing coordinate so the path bridges the gap
+            # (summing around NaN segments would drop both legs of it)
+            valid = ~(np.isnan(lats) | np.isnan(lons))
+            lats, lons = lats[valid], lons[valid]
+            # Drop repeated positions (stationary float) before the trig pass
+            total_distance = 0.0
+            if len(lats) > 1:
+                moved = np.abs(np.diff(lats)) + np.abs(np.diff(lons)) > 1e-6
+                keep = np.concatenate(([True], moved))
+                total_distance = float(_haversine_path_km(lats[keep], lons[keep]).sum())
             
             insights["highlight"] = {
                 "type": "trajectory",
@@ -1092,7 +1646,7 @@ def _trajectory_insights(df, data_records, intent, insights):
             # Time span
             if 'timestamp' in df.columns:
                 try:
-                    timestamps = pd.to_datetime(df['timestamp'])
+                    timestamps = _parse_timestamps(df['timestamp'])
                     time_span = (timestamps.max() - timestamps.min()).days
                     insights["stats"]["time_span_days"] = time_span
                     if time_span > 0:
@@ -1223,15 +1777,28 @@ def _get_unit(metric):
     return units.get(metric, '')
 
 
-def _haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points in km."""
-    import math
-    R = 6371  # Earth radius in km
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    return R * 2 * math.asin(math.sqrt(a))
+def _haversine_path_km(lats, lons):
+    """Segment distances (km) between consecutive points, computed with NumPy."""
+    lat = np.radians(lats)
+    lon = np.radians(lons)
+    dlat = np.diff(lat)
+    dlon = np.diff(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    return 6371 * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Format the pipeline serializes datetime columns to (see _answer_question)
+_RECORD_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _parse_timestamps(series):
+    """Parse a timestamp column, using the known record format before inference."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    try:
+        return pd.to_datetime(series, format=_RECORD_TIMESTAMP_FORMAT, cache=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(series, cache=True)
 
 
 def recommend_visualization(query_type, df, intent):
@@ -1439,7 +2006,7 @@ def build_metadata(df, intent, db_context, processing_time):
     # Time range of data
     if 'timestamp' in df.columns and not df.empty:
         try:
-            timestamps = pd.to_datetime(df['timestamp'])
+            timestamps = _parse_timestamps(df['timestamp'])
             metadata["data_period"] = {
                 "from": timestamps.min().strftime('%Y-%m-%d'),
                 "to": timestamps.max().strftime('%Y-%m-%d')
@@ -1476,12 +2043,262 @@ def build_metadata(df, intent, db_context, processing_time):
     return metadata
 
 
-def get_intelligent_answer(user_question: str):
+def compute_summary_stats(df):
+    """
+    Build the pre-formatted statistic fragments used in the LLM results summary.
+    Pure pandas reductions, so it is safe to run alongside the records conversion.
+    """
+    stats = {}
+    if df.empty:
+        return stats
+
+    # One agg call so each column is scanned once for all of its reductions
+    wanted = {
+        'distance_km': ['min', 'max'],
+        'temperature': ['count', 'mean', 'min', 'max'],
+        'salinity': ['count', 'mean'],
+        'latitude': ['min', 'max'],
+        'longitude': ['min', 'max'],
+        'pressure': ['count', 'max'],
+    }
+    spec = {col: funcs for col, funcs in wanted.items() if col in df.columns}
+    agg = df.agg(spec) if spec else None
+
+    if 'distance_km' in spec:
+        stats["distance"] = f"Closest: {agg.at['min', 'distance_km']:.1f}km, Farthest: {agg.at['max', 'distance_km']:.1f}km."
+
+    if 'float_id' in df.columns:
+        # One hash pass serves both the count and the first few IDs
+        uniq = pd.unique(df['float_id'].to_numpy())
+        unique_floats = uniq.size
+        float_ids = uniq[:5].tolist()
+        stats["floats"] = f"{unique_floats} unique float(s): {float_ids}."
+
+    if 'temperature' in spec and agg.at['count', 'temperature'] > 0:
+        avg_temp = agg.at['mean', 'temperature']
+        min_temp = agg.at['min', 'temperature']
+        max_temp = agg.at['max', 'temperature']
+        stats["temperature"] = f"Temperature: avg {avg_temp:.1f}°C (range: {min_temp:.1f} - {max_temp:.1f}°C)."
+
+    if 'salinity' in spec and agg.at['count', 'salinity'] > 0:
+        stats["salinity"] = f"Avg salinity: {agg.at['mean', 'salinity']:.2f} PSU."
+
+    if 'latitude' in spec and 'longitude' in spec:
+        lat_range = f"{agg.at['min', 'latitude']:.1f}° to {agg.at['max', 'latitude']:.1f}°N"
+        lon_range = f"{agg.at['min', 'longitude']:.1f}° to {agg.at['max', 'longitude']:.1f}°E"
+        stats["coverage"] = f"Coverage: {lat_range}, {lon_range}."
+
+    if 'timestamp' in df.columns:
+        try:
+            if pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+                date_min = df['timestamp'].min().strftime('%b %d')
+                date_max = df['timestamp'].max().strftime('%b %d, %Y')
+            else:
+                date_min = str(df['timestamp'].min())[:10]
+                date_max = str(df['timestamp'].max())[:10]
+            stats["time_span"] = f"Time span: {date_min} to {date_max}."
+        except:
+            pass
+
+    if 'pressure' in spec and agg.at['count', 'pressure'] > 0:
+        stats["depth"] = f"Max depth: {agg.at['max', 'pressure']:.0f} dbar."
+
+    return stats
+
+
+def _dedup_column_names(columns):
+    """Suffix repeated column names with _1, _2, ... (first occurrence keeps its name)."""
+    occurrence = pd.Series(columns).groupby(list(columns)).cumcount().to_numpy()
+    return [f"{col}_{n}" if n else col for col, n in zip(columns, occurrence)]
+
+
+def _fast_records(df):
+    """
+    Convert a DataFrame to JSON-ready records, mapping NaN to None.
+    Only float/object columns that actually contain NaN are touched, so
+    int and datetime blocks are never up-cast to object dtype.
+    """
+    records = df.to_dict(orient='records')
+    nan_cols = [c for c in df.columns if df[c].dtype.kind in 'fO' and df[c].isna().any()]
+    if nan_cols:
+        for rec in records:
+            for c in nan_cols:
+                v = rec[c]
+                if v is not None and v != v:  # NaN is the only value not equal to itself
+                    rec[c] = None
+    return records
+
+
+# Question caches, outermost first (app.py keeps no query cache of its own):
+#   _response_cache  exact normalized question -> full answer   RESPONSE_CACHE_TTL (10 min)
+#   semantic cache   paraphrases of a cached question (opt-in)  RESPONSE_CACHE_TTL
+#   _intent_cache    normalized question -> sanitized intent     INTENT_CACHE_TTL (1 h)
+#   _llm_cache       exact LLM inputs -> intent JSON / summary   LLM_CACHE_TTL (24 h)
+# Only answers whose intent and summary both came from the LLM are stored in the
+# first two; the inner ones are keyed on inputs, so they outlive a stale answer.
+
+# Full-response cache for repeated questions (skips SQL and both LLM calls)
+_response_cache = {}
+RESPONSE_CACHE_TTL = 600  # 10 minutes, same horizon as the DB context
+RESPONSE_CACHE_MAX = 2048
+_response_cache_lock = threading.Lock()
+# Questions relative to "now" must always be recomputed
+_TIME_RELATIVE_WORDS = {"today", "now", "latest", "current", "recent", "yesterday"}
+
+def _response_cache_key(question):
+    """Return a cache key for a question, or None if it must not be cached."""
+    normalized = " ".join(question.lower().split()).rstrip("?.! ")
+    if _TIME_RELATIVE_WORDS.intersection(normalized.split()):
+        return None
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+def _get_cached_response(key):
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+    if entry and time.time() - entry[1] < RESPONSE_CACHE_TTL:
+        return dict(entry[0])  # shallow copy so callers can annotate it
+    return None
+
+def _set_cached_response(key, payload):
+    with _response_cache_lock:
+        if len(_response_cache) >= RESPONSE_CACHE_MAX:
+            _response_cache.pop(next(iter(_response_cache)), None)
+        _response_cache[key] = (payload, time.time())
+
+# Optional semantic cache: paraphrased questions reuse a stored response when
+# their sentence embeddings are close enough. Opt-in (the model needs ~80MB RAM).
+_semantic_model = None  # None = not loaded yet, False = unavailable/disabled
+_semantic_matrix = None  # (N, dim) normalized embeddings
+_semantic_entries = []   # parallel list of (payload, timestamp, signature)
+_semantic_lock = threading.Lock()
+SEMANTIC_CACHE_MAX = 512
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+_NUMBER_TOKEN_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+def _get_semantic_model():
+    global _semantic_model
+    if _semantic_model is None:
+        if os.getenv("ENABLE_SEMANTIC_CACHE", "0") not in ("1", "true", "yes"):
+            _semantic_model = False
+        else:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _semantic_model = SentenceTransformer("all-MiniLM-L6-v2")
+                print("✅ Semantic cache enabled (all-MiniLM-L6-v2)")
+            except Exception as e:
+                print(f"⚠️ Semantic cache disabled: {e}")
+                _semantic_model = False
+    return _semantic_model or None
+
+def _embed_question(question):
+    """Return a normalized embedding for the question, or None if the cache is off."""
+    model = _get_semantic_model()
+    if model is None:
+        return None
+    return model.encode(question.strip().lower(), normalize_embeddings=True).astype(np.float32)
+
+def _semantic_signature(question_lower):
+    """
+    Literal parts a paraphrase must share exactly: float IDs, years, coordinates
+    and limits differ by a digit but embed almost identically, as do locations.
+    """
+    return tuple(_NUMBER_TOKEN_RE.findall(question_lower)), find_location_name(question_lower)
+
+def _get_semantic_cached_response(vec, signature):
+    with _semantic_lock:
+        if _semantic_matrix is None:
+            return None
+        sims = _semantic_matrix @ vec
+        # Only entries with the same numbers and location are candidates
+        sims[[entry[2] != signature for entry in _semantic_entries]] = -np.inf
+        best = int(np.argmax(sims))
+        payload, stored_at, _ = _semantic_entries[best]
+    if sims[best] >= SEMANTIC_CACHE_THRESHOLD and time.time() - stored_at < RESPONSE_CACHE_TTL:
+        return dict(payload)
+    return None
+
+def _set_semantic_cached_response(vec, signature, payload):
+    global _semantic_matrix, _semantic_entries
+    with _semantic_lock:
+        if _semantic_matrix is None:
+            _semantic_matrix = vec[np.newaxis, :]
+            _semantic_entries = [(payload, time.time(), signature)]
+            return
+        if len(_semantic_entries) >= SEMANTIC_CACHE_MAX:
+            _semantic_matrix = _semantic_matrix[1:]
+            _semantic_entries = _semantic_entries[1:]
+        _semantic_matrix = np.vstack([_semantic_matrix, vec])
+        _semantic_entries = _semantic_entries + [(payload, time.time(), signature)]
+
+# Per-stage LLM output cache (intent JSON text, summary text). Outlives the
+# response cache because it is keyed on the exact LLM inputs.
+_llm_cache = {}
+LLM_CACHE_TTL = 86400  # 24 hours
+LLM_CACHE_MAX = 1024
+_llm_cache_lock = threading.Lock()
+
+def _llm_cache_key(*parts):
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+def _get_cached_llm_output(key):
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+    if entry and time.time() - entry[1] < LLM_CACHE_TTL:
+        return entry[0]
+    return None
+
+def _set_cached_llm_output(key, output):
+    with _llm_cache_lock:
+        if len(_llm_cache) >= LLM_CACHE_MAX:
+            _llm_cache.pop(next(iter(_llm_cache)), None)
+        _llm_cache[key] = (output, time.time())
+
+# Sanitized intents keyed by normalized question; LRU order.
+# Cleared by get_argo_columns when the argo_data schema changes
+_intent_cache = {}
+INTENT_CACHE_TTL = 3600
+INTENT_CACHE_MAX = 512
+_intent_cache_lock = threading.Lock()
+
+def _get_cached_intent(key):
+    """Return a fresh copy of a memoized sanitized intent, or None."""
+    with _intent_cache_lock:
+        entry = _intent_cache.pop(key, None)
+        if entry is None or time.time() - entry[1] >= INTENT_CACHE_TTL:
+            return None
+        _intent_cache[key] = entry  # re-insert as most recently used
+    return _json_loads(entry[0])
+
+def _set_cached_intent(key, intent):
+    entry = (_json_dumps(intent), time.time())
+    with _intent_cache_lock:
+        if len(_intent_cache) >= INTENT_CACHE_MAX:
+            _intent_cache.pop(next(iter(_intent_cache)), None)
+        _intent_cache[key] = entry
+
+@functools.lru_cache(maxsize=256)
+def _cached_time_clause(time_constraint, max_date_ymd):
+    """Memoized sql_builder._get_time_clause; it only depends on the date part of max_date."""
+    return sql_builder._get_time_clause(time_constraint, datetime.fromisoformat(max_date_ymd))
+
+# Years that commonly fall outside the loaded data window (see empty-result hints)
+_STALE_YEAR_RE = re.compile(r'202[0-3]')
+
+
+# Questions currently being answered, keyed like the response cache
+_inflight_requests = {}
+_inflight_lock = threading.Lock()
+COALESCE_WAIT_TIMEOUT = 120  # seconds a duplicate waits on the leader's answer
+
+
+def get_intelligent_answer(user_question: str, on_token=None):
     """
     Main function to process user questions and return intelligent answers.
     Uses SMART AI ROUTING for optimal performance:
       - Simple queries → Groq (fast)
       - Complex ocean queries → DeepSeek (reliable)
+    If on_token is given, summary text is passed to it as the LLM generates
+    it (cached and conversational answers are returned without calling it).
     """
     import logging
     logging.basicConfig(filename="backend.log", level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -1489,18 +2306,274 @@ def get_intelligent_answer(user_question: str):
     start_time = time.time()
     
     # === STEP 0: Check for simple conversational messages ===
-    conversational_response = handle_conversational_query(user_question)
+    trivial = _trivial_reply(user_question)
+    if trivial is not None:
+        return trivial
+    question_analysis = analyze_question(user_question)
+    conversational_response = handle_conversational_query(user_question, question_analysis)
     if conversational_response:
         return conversational_response
-    
+
+    cache_key = _response_cache_key(user_question)
+    if cache_key is not None:
+        cached_response = _get_cached_response(cache_key)
+        if cached_response is not None:
+            logging.info(f"Response cache hit for: {user_question[:50]}...")
+            cached_response["cached"] = True
+            return cached_response
+    question_vec = _embed_question(user_question) if cache_key is not None else None
+    if question_vec is not None:
+        cached_response = _get_semantic_cached_response(question_vec, _semantic_signature(question_analysis["lower"]))
+        if cached_response is not None:
+            logging.info(f"Semantic cache hit for: {user_question[:50]}...")
+            cached_response["cached"] = True
+            return cached_response
+
+    if cache_key is None:
+        return _answer_question(user_question, question_analysis, cache_key, question_vec, start_time, on_token)
+
+    # Coalesce identical in-flight questions: the first caller does the work,
+    # concurrent duplicates wait for its result instead of repeating the LLM calls
+    with _inflight_lock:
+        inflight = _inflight_requests.get(cache_key)
+        is_leader = inflight is None
+        if is_leader:
+            inflight = Future()
+            _inflight_requests[cache_key] = inflight
+    if not is_leader:
+        logging.info(f"Joining in-flight request for: {user_question[:50]}...")
+        try:
+            return dict(inflight.result(timeout=COALESCE_WAIT_TIMEOUT))
+        except FutureTimeoutError:
+            # The leader is stuck; answer independently rather than wait on it
+            logging.warning(f"In-flight leader timed out for: {user_question[:50]}...")
+            return _answer_question(user_question, question_analysis, cache_key, question_vec, start_time, on_token)
+    try:
+        result = _answer_question(user_question, question_analysis, cache_key, question_vec, start_time, on_token)
+        inflight.set_result(result)
+        return result
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_requests.pop(cache_key, None)
+
+
+def _as_int(value, default=None):
+    try:
+        if value is None or value == "":
+            return default
+        return int(str(value).strip())
+    except Exception:
+        return default
+
+def _as_float(value, default=None):
+    try:
+        if value is None or value == "":
+            return default
+        return float(str(value).strip())
+    except Exception:
+        return default
+
+def _as_km(value, default=None):
+    """Like _as_int, but strings such as 'within 500 km' yield their first integer."""
+    if isinstance(value, str):
+        m_dist = _DIGITS_RE.search(value)
+        return int(m_dist.group(0)) if m_dist else default
+    return _as_int(value, default)
+
+# (intent key, caster, default) applied to every key the intent carries
+_CAST_TABLE = (
+    ("float_id", _as_int, None),
+    ("limit", _as_int, 5),
+    ("distance_km", _as_km, 500),
+    ("latitude", _as_float, None),
+    ("longitude", _as_float, None),
+)
+
+
+def _parse_intent(user_question, question_analysis, columns_future, intent_provider, intent_llm, query_complexity):
+    """
+    Turn a question into a sanitized intent dict: LLM parse (or regex fallback),
+    regex assists, defaults and type coercion.
+    columns_future resolves to the argo_data column set; it is only waited on
+    after the LLM call, so a cold column lookup overlaps it.
+    Returns (intent, parsed_by_llm); only LLM-parsed intents are worth memoizing.
+    """
+    import logging
+    # Use retry logic for robustness
+    parsed_by_llm = False
+    intent_cache_key = _llm_cache_key("intent", " ".join(user_question.strip().lower().split()))
+    intent_json_str = _get_cached_llm_output(intent_cache_key)
+    fresh_reply = intent_json_str is None
+    if fresh_reply:
+        intent_inputs = {"question": user_question,
+                         "location_hint": find_location_name(question_analysis["lower"]) or "none"}
+        try:
+            intent_json_str = invoke_with_failover("intent", intent_inputs, intent_provider, intent_llm, query_complexity)
+        except LLMBusyError as busy:
+            # Degrade to the regex parser below instead of queueing behind stalled calls
+            logging.warning(f"{busy}. Using fallback intent parser.")
+            intent_json_str = ""
+
+    # Extract JSON from response (handle markdown code blocks)
+    intent_json_str = intent_json_str.strip()
+    if intent_json_str.startswith("```"):
+        # Remove markdown code block
+        intent_json_str = _MD_FENCE_OPEN_RE.sub('', intent_json_str)
+        intent_json_str = _MD_FENCE_CLOSE_RE.sub('', intent_json_str)
+    
+    payload = _extract_json_object(intent_json_str)
+    if payload is None:
+        logging.error(f"LLM did not return valid JSON. Response: {intent_json_str[:200]}")
+        # Fallback: try to construct a basic intent from the question
+        intent = _fallback_intent_parser(user_question)
+    else:
+        try:
+            intent = _json_loads(payload)
+            parsed_by_llm = True
+            if fresh_reply:
+                # Cache only the extracted object once it parses; a malformed or chatty
+                # reply must not be replayed for LLM_CACHE_TTL
+                _set_cached_llm_output(intent_cache_key, payload)
+        except json.JSONDecodeError as je:
+            logging.error(f"JSON parse error: {je}. Attempting fallback...")
+            intent = _fallback_intent_parser(user_question)
+
+
+    # --- Fallback pre-processing BEFORE sanitization (regex assist) ---
+    # Extract coordinates if user typed them explicitly (e.g., 'latitude 13 longitude 80.25'),
+    # an explicit limit like 'nearest 5 floats' and 'nearest'/'within N km' wording in a
+    # single pass (first occurrence wins), then a number pair like 'near 13, 80.25'
+    # searched over the whole question when no latitude/longitude keywords were found
+    hits = {}
+    for m in _QUESTION_HINTS_RE.finditer(user_question):
+        hits.setdefault(m.lastgroup, m)
+    mentions_nearest = "near" in hits or ("limit" in hits and hits["limit"].group("limit_kw").lower() == "nearest")
+    coord_lat = None; coord_lon = None
+    if "lat" in hits and "lon" in hits:
+        try:
+            coord_lat = float(hits["lat"].group("lat_v")); coord_lon = float(hits["lon"].group("lon_v"))
+        except Exception:
+            coord_lat = coord_lon = None
+    if coord_lat is None or coord_lon is None:
+        pair_match = _COORD_PAIR_RE.search(user_question)
+        if pair_match:
+            try:
+                coord_lat = float(pair_match.group(1)); coord_lon = float(pair_match.group(2))
+            except Exception:
+                coord_lat = coord_lon = None
+    explicit_limit = int(hits["limit"].group("limit_v")) if "limit" in hits else None
+    
+    # Extract time constraints from the question (robust fallback)
+    explicit_time_constraint = None
+    # Pattern: "March 2025" or "march 2025" or "Mar 2025"
+    month_year_match = _MONTH_YEAR_RE.search(user_question)
+    if month_year_match:
+        month_str = month_year_match.group(1).lower()[:3]
+        year_str = month_year_match.group(2)
+        explicit_time_constraint = f"{month_str} {year_str}"
+    else:
+        # Pattern: "2025" alone
+        year_match = _DATA_YEAR_RE.search(user_question)
+        if year_match:
+            explicit_time_constraint = year_match.group(1)
+
+    # --- MASTER SANITIZER STEP ---
+    actual_columns = columns_future.result()
+    intent["query_type"] = intent.get("query_type", "General")
+    # Dedup (order-preserving) and keep only metrics that exist in DB, in one pass
+    metrics = intent.get("metrics") or []
+    if isinstance(metrics, str):
+        metrics = [metrics]
+    intent["metrics"] = [m for m in dict.fromkeys(metrics) if m and m in actual_columns]
+
+
+    # Fix: Extract float_id from location_name if present, never treat as location
+    if intent.get("location_name") and str(intent["location_name"]).lower().startswith("float"):
+        float_id_str = str(intent["location_name"]).lower().replace("float", "").strip()
+        try:
+            intent["float_id"] = int(float_id_str)
+        except Exception:
+            pass
+        intent["location_name"] = None
+    # If no requested metric exists in DB, just use all available metrics
+    if not intent["metrics"]:
+        # Use all available metrics except coordinates and IDs
+        intent["metrics"] = [col for col in actual_columns if col not in ["latitude", "longitude", "float_id", "timestamp"]]
+    if not intent["metrics"]:
+        # If still empty, just use temperature if present
+        if "temperature" in actual_columns:
+            intent["metrics"] = ["temperature"]
+        elif len(actual_columns) > 0:
+            intent["metrics"] = [list(actual_columns)[0]]
+        else:
+            intent["metrics"] = []
+
+    # Map legacy/alternate types
+    if intent["query_type"] == "Path":
+        intent["query_type"] = "Trajectory"
+
+    # Inject coordinates if not provided by LLM but detected via regex
+    if coord_lat is not None and coord_lon is not None and "latitude" not in intent and "longitude" not in intent:
+        intent["latitude"] = coord_lat
+        intent["longitude"] = coord_lon
+        # If user referenced 'nearest' and query_type not set use Proximity
+        if mentions_nearest and intent["query_type"] not in ["Proximity"]:
+            intent["query_type"] = "Proximity"
+
+    # Apply explicit numeric limit if parsed and no limit already
+    if explicit_limit and "limit" not in intent:
+        intent["limit"] = explicit_limit
+    
+    # Apply explicit time constraint if LLM missed it
+    if explicit_time_constraint and not intent.get("time_constraint"):
+        intent["time_constraint"] = explicit_time_constraint
+        logging.info(f"Applied fallback time_constraint: {explicit_time_constraint}")
+
+    # Proximity location fallback (distance_km is cast and defaulted via _CAST_TABLE below)
+    if intent.get("query_type") == "Proximity":
+        lat = intent.get("latitude")
+        lon = intent.get("longitude")
+        location_name = (intent.get("location_name") or "").lower()
+        if (lat is None or lon is None) and location_name in sql_builder.LOCATION_CENTERS:
+            lat, lon = sql_builder.LOCATION_CENTERS[location_name]
+            intent["latitude"] = lat
+            intent["longitude"] = lon
+        # Default limit if not present
+        if "limit" not in intent:
+            intent["limit"] = 5
+
+    # Normalize basic numeric fields early (robust casting)
+    for key, cast, default in _CAST_TABLE:
+        if key in intent:
+            intent[key] = cast(intent[key], default)
+    if intent.get("limit") is None:
+        intent["limit"] = 5
+    if intent.get("query_type") == "Proximity" and "distance_km" not in intent:
+        intent["distance_km"] = 500
+
+    # Remove None values from intent (except for metrics, which we now always fill)
+    for k in list(intent.keys()):
+        if k != "metrics" and intent[k] is None:
+            intent.pop(k)
+
+    intent["location_clause"] = LOCATIONS.get((intent.get("location_name") or "").lower(), "1=1")
+    return intent, parsed_by_llm
+
+
+def _answer_question(user_question, question_analysis, cache_key, question_vec, start_time, on_token=None):
+    """Run the full parse → SQL → summarize pipeline for a question (no cache lookups)."""
+    import logging
     try:
-        load_dotenv()
         engine = get_engine()
         
         # 🧠 SMART AI ROUTING - classify query and route to best AI
-        query_complexity = classify_query_complexity(user_question)
+        query_complexity = classify_query_complexity(user_question, question_analysis)
         logging.info(f"Query complexity: {query_complexity} for: {user_question[:50]}...")
-        llm = get_llm(query_complexity=query_complexity)  # Smart routing!
+        provider, llm = get_llm_with_provider(query_complexity=query_complexity)  # Smart routing!
+        intent_provider, intent_llm = get_intent_llm_with_provider(query_complexity)
 
         context = get_database_context(engine)
         if not context:
@@ -1516,298 +2589,28 @@ def get_intelligent_answer(user_question: str):
             max_date_str = max_date.strftime("%b %d, %Y") if hasattr(max_date, 'strftime') else str(max_date)[:10]
             data_range_info = f"Data available: {min_date_str} to {max_date_str}"
 
-        # === STEP 1: Parse user intent with LLM ===
-        prompt = PromptTemplate.from_template(INTENT_PARSER_PROMPT)
-        parser_chain = prompt | llm | StrOutputParser()
-        
-        # Use retry logic for robustness
-        intent_json_str = invoke_with_retry(parser_chain, {"question": user_question}, max_retries=2)
-
-        # Extract JSON from response (handle markdown code blocks)
-        intent_json_str = intent_json_str.strip()
-        if intent_json_str.startswith("```"):
-            # Remove markdown code block
-            intent_json_str = re.sub(r'^```(?:json)?\s*', '', intent_json_str)
-            intent_json_str = re.sub(r'\s*```$', '', intent_json_str)
-        
-        match = re.search(r'\{.*\}', intent_json_str, re.DOTALL)
-        if not match:
-            logging.error(f"LLM did not return valid JSON. Response: {intent_json_str[:200]}")
-            # Fallback: try to construct a basic intent from the question
-            intent = _fallback_intent_parser(user_question)
-        else:
-            try:
-                intent = json.loads(match.group(0))
-            except json.JSONDecodeError as je:
-                logging.error(f"JSON parse error: {je}. Attempting fallback...")
-                intent = _fallback_intent_parser(user_question)
-
-
-        # --- Fallback pre-processing BEFORE sanitization (regex assist) ---
-        # Extract coordinates if user typed them explicitly (e.g., 'latitude 13 longitude 80.25')
-        coord_lat = None; coord_lon = None
-        lat_match = re.search(r'latitude\s+(-?\d+(?:\.\d+)?)', user_question, re.IGNORECASE)
-        lon_match = re.search(r'longitude\s+(-?\d+(?:\.\d+)?)', user_question, re.IGNORECASE)
-        if lat_match and lon_match:
-            try:
-                coord_lat = float(lat_match.group(1)); coord_lon = float(lon_match.group(1))
-            except Exception:
-                coord_lat = coord_lon = None
-        # Pattern like 'near 13, 80.25' or '13 80.25' following 'nearest'
-        if coord_lat is None or coord_lon is None:
-            pair_match = re.search(r'(?:near|at|around)?\s*(-?\d+(?:\.\d+)?)\s*[, ]\s*(-?\d+(?:\.\d+)?)', user_question, re.IGNORECASE)
-            if pair_match:
-                try:
-                    coord_lat = float(pair_match.group(1)); coord_lon = float(pair_match.group(2))
-                except Exception:
-                    coord_lat = coord_lon = None
-        # Extract explicit limit like 'nearest 5 floats' if LLM misses it
-        explicit_limit = None
-        limit_match = re.search(r'(?:nearest|top|find)\s+(\d{1,3})\s+(?:float|ARGO)', user_question, re.IGNORECASE)
-        if limit_match:
-            explicit_limit = int(limit_match.group(1))
-        
-        # Extract time constraints from the question (robust fallback)
-        explicit_time_constraint = None
-        month_names = {"jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
-                       "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
-                       "aug": 8, "august": 8, "sep": 9, "september": 9, "oct": 10, "october": 10,
-                       "nov": 11, "november": 11, "dec": 12, "december": 12}
-        
-        # Pattern: "March 2025" or "march 2025" or "Mar 2025"
-        month_year_match = re.search(r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s*(\d{4})\b', user_question, re.IGNORECASE)
-        if month_year_match:
-            month_str = month_year_match.group(1).lower()[:3]
-            year_str = month_year_match.group(2)
-            explicit_time_constraint = f"{month_str} {year_str}"
-        else:
-            # Pattern: "2025" alone
-            year_match = re.search(r'\b(20[12]\d)\b', user_question)
-            if year_match:
-                explicit_time_constraint = year_match.group(1)
-
-        # --- MASTER SANITIZER STEP ---
-        intent["query_type"] = intent.get("query_type", "General")
-        intent["metrics"] = [m for m in intent.get("metrics", []) if m]
-
-        # Get actual columns from DB
-        with engine.connect() as connection:
-            insp = connection.execute(text("SELECT column_name FROM information_schema.columns WHERE table_name = 'argo_data';"))
-            actual_columns = set(row[0] for row in insp)
-
-        # Fix: Extract float_id from location_name if present, never treat as location
-        if intent.get("location_name") and str(intent["location_name"]).lower().startswith("float"):
-            float_id_str = str(intent["location_name"]).lower().replace("float", "").strip()
-            try:
-                intent["float_id"] = int(float_id_str)
-            except Exception:
-                pass
-            intent["location_name"] = None
-        # Only keep metrics that exist in DB, but if none, just use all available metrics
-        intent["metrics"] = [m for m in intent["metrics"] if m in actual_columns]
-        if not intent["metrics"]:
-            # Use all available metrics except coordinates and IDs
-            intent["metrics"] = [col for col in actual_columns if col not in ["latitude", "longitude", "float_id", "timestamp"]]
-        if not intent["metrics"]:
-            # If still empty, just use temperature if present
-            if "temperature" in actual_columns:
-                intent["metrics"] = ["temperature"]
-            elif len(actual_columns) > 0:
-                intent["metrics"] = [list(actual_columns)[0]]
-            else:
-                intent["metrics"] = []
-
-        # Map legacy/alternate types
-        if intent["query_type"] == "Path":
-            intent["query_type"] = "Trajectory"
-
-        # Inject coordinates if not provided by LLM but detected via regex
-        if coord_lat is not None and coord_lon is not None and not any(k in intent for k in ["latitude","longitude"]):
-            intent["latitude"] = coord_lat
-            intent["longitude"] = coord_lon
-            # If user referenced 'nearest' and query_type not set use Proximity
-            if re.search(r'nearest|within\s+\d+\s*km', user_question, re.IGNORECASE) and intent["query_type"] not in ["Proximity"]:
-                intent["query_type"] = "Proximity"
-
-        # Apply explicit numeric limit if parsed and no limit already
-        if explicit_limit and "limit" not in intent:
-            intent["limit"] = explicit_limit
-        
-        # Apply explicit time constraint if LLM missed it
-        if explicit_time_constraint and not intent.get("time_constraint"):
-            intent["time_constraint"] = explicit_time_constraint
-            logging.info(f"Applied fallback time_constraint: {explicit_time_constraint}")
-
-        # Proximity location fallback and robust distance parsing
-        if intent.get("query_type") == "Proximity":
-            lat = intent.get("latitude")
-            lon = intent.get("longitude")
-            location_name = (intent.get("location_name") or "").lower()
-            location_centers = {
-                # Indian Ocean
-                "arabian sea": (15, 62.5),
-                "bay of bengal": (13.5, 87.5),
-                "indian ocean": (0, 75),
-                "andaman sea": (10, 95),
-                "laccadive sea": (11, 74),
-                "red sea": (20, 38),
-                "persian gulf": (27, 52),
-                "mozambique channel": (-18, 40),
-                # Pacific Ocean
-                "pacific ocean": (0, 160),
-                "south china sea": (15, 115),
-                "philippine sea": (20, 130),
-                "coral sea": (-16, 155),
-                "tasman sea": (-37, 162),
-                # Atlantic Ocean
-                "atlantic ocean": (25, -40),
-                "caribbean sea": (17, -75),
-                "gulf of mexico": (25, -90),
-                "mediterranean sea": (38, 18),
-                "north sea": (56, 3),
-                # Cities
-                "chennai": (13, 80.25),
-                "mumbai": (19, 72.75),
-                "sri lanka": (7.5, 80.5),
-                "singapore": (1.3, 104),
-                "tokyo": (35.5, 140),
-                "sydney": (-34, 151),
-                "cape town": (-34, 18),
-                "miami": (26, -80),
-                # Special
-                "equator": (0, 80),
-                "southern ocean": (-55, 0),
-                "tropics": (10, 80),
-            }
-            if (lat is None or lon is None) and location_name in location_centers:
-                lat, lon = location_centers[location_name]
-                intent["latitude"] = lat
-                intent["longitude"] = lon
-            # Parse distance_km robustly
-            if "distance_km" in intent:
-                try:
-                    # Accept both int and string like 'within 500 km'
-                    if isinstance(intent["distance_km"], str):
-                        match = re.search(r"\d+", intent["distance_km"])
-                        if match:
-                            intent["distance_km"] = int(match.group(0))
-                        else:
-                            intent["distance_km"] = 500
-                    elif not isinstance(intent["distance_km"], int):
-                        intent["distance_km"] = 500
-                except Exception:
-                    intent["distance_km"] = 500
-            else:
-                intent["distance_km"] = 500
-            # Default limit if not present
-            if "limit" not in intent:
-                intent["limit"] = 5
-
-        # Normalize basic numeric fields early (robust casting)
-        def _as_int(value, default=None):
-            try:
-                if value is None or value == "":
-                    return default
-                return int(str(value).strip())
-            except Exception:
-                return default
-        def _as_float(value, default=None):
-            try:
-                if value is None or value == "":
-                    return default
-                return float(str(value).strip())
-            except Exception:
-                return default
-
-        if "float_id" in intent:
-            intent["float_id"] = _as_int(intent.get("float_id"))
-        if "limit" in intent:
-            intent["limit"] = _as_int(intent.get("limit"), 5)
-        if intent.get("limit") is None:
-            intent["limit"] = 5
-        if "distance_km" in intent:
-            # Extract first integer occurrence
-            if isinstance(intent["distance_km"], str):
-                m_dist = re.search(r"\d+", intent["distance_km"])
-                intent["distance_km"] = _as_int(m_dist.group(0)) if m_dist else 500
-            else:
-                intent["distance_km"] = _as_int(intent["distance_km"], 500)
-        if intent.get("query_type") == "Proximity" and "distance_km" not in intent:
-            intent["distance_km"] = 500
-        # Optional future latitude/longitude numeric casting if LLM adds them
-        if "latitude" in intent:
-            intent["latitude"] = _as_float(intent.get("latitude"))
-        if "longitude" in intent:
-            intent["longitude"] = _as_float(intent.get("longitude"))
-
-        # Remove None values from intent (except for metrics, which we now always fill)
-        for k in list(intent.keys()):
-            if k != "metrics" and intent[k] is None:
-                intent.pop(k)
-
-        intent["location_clause"] = LOCATIONS.get((intent.get("location_name") or "").lower(), "1=1")
-        # Remove any metrics/columns that do not exist in DB for this query
-        intent["metrics"] = [m for m in intent["metrics"] if m in actual_columns]
-        try:
-            generated_sql = sql_builder.build_query(intent, {"max_date_obj": context.get("max_date")}, engine)
-        except ValueError as ve:
-            # Specific guidance for profile/trajectory builder errors
-            return {
-                "query_type": "Error",
-                "summary": str(ve),
-                "data": [],
-                "sql_query": "N/A"
-            }
-        logging.info(f"Intent: {json.dumps(intent)} | Generated SQL: {generated_sql}")
-
-        # SQL builder detected logical error
-        if isinstance(generated_sql, str) and generated_sql.startswith("ERROR:"):
-            error_msg = generated_sql[6:].strip()
-            # Provide direct error message to user (no fake fallback data)
-            return {
-                "query_type": "Error",
-                "summary": error_msg,
-                "data": [],
-                "sql_query": generated_sql
-            }
-
-        with engine.connect() as connection:
-            df = pd.read_sql_query(sql=text(generated_sql), con=connection)
-
-        # DataFrame column uniqueness fix (safe fallback)
-        if len(set(df.columns)) < len(df.columns):
-            seen = {}
-            new_cols = []
-            for col in df.columns:
-                if col in seen:
-                    seen[col] += 1
-                    new_cols.append(f"{col}_{seen[col]}")
-                else:
-                    seen[col] = 0
-                    new_cols.append(col)
-            df.columns = new_cols
-
-        # If data is missing for graph/series queries, fill with random/similar values
-        data_records = []
-        if not df.empty:
-            for col in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[col]):
-                    df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-            df = df.replace({np.nan: None})
-            data_records = df.to_dict(orient='records')
-        # Removed synthetic random data generation: keep empty to be transparent
-
-
-        # Only keep unsupported location and missing float ID checks (not metric integrity)
+        # === STEP 1: Parse user intent (memoized per normalized question) ===
+        intent_key = " ".join(user_question.strip().lower().split())
+        intent = _get_cached_intent(intent_key)
+        parsed_by_llm = intent is not None  # only LLM-parsed intents are memoized
+        if intent is None:
+            intent, parsed_by_llm = _parse_intent(user_question, question_analysis, argo_columns_future(engine),
+                                                  intent_provider, intent_llm, query_complexity)
+            if parsed_by_llm:
+                _set_cached_intent(intent_key, intent)
+        # Only keep unsupported location and missing float ID checks (not metric integrity).
+        # They depend on the intent alone, so run them before the main query: each request
+        # then checks out one pooled connection (float list or data), never both.
         # Unsupported location check
         if intent.get("location_name") and intent["location_clause"] == "1=1":
-            valid_locations = list(LOCATIONS.keys())
             return {
                 "query_type": "Error",
-                "summary": f"Location '{intent['location_name']}' is not supported. Valid locations are: {', '.join(valid_locations)}.",
+                "summary": f"Location '{intent['location_name']}' is not supported. Valid locations are: {_VALID_LOCATIONS_TEXT}.",
                 "data": []
             }
 
+        now = datetime.now()  # single clock read shared by the checks below
+
         # Missing float ID check: suggest available floats for user's filters
         if intent.get("query_type") in ["Trajectory", "Profile"] and not intent.get("float_id"):
             # Find available floats for the user's location/time filter
@@ -1815,16 +2618,23 @@ def get_intelligent_answer(user_question: str):
             if intent.get("location_clause"):
                 where_clauses.append(intent["location_clause"])
             if intent.get("time_constraint"):
-                max_date = context.get("max_date") or datetime.now()
-                time_clause = sql_builder._get_time_clause(intent["time_constraint"], max_date)
+                max_date = context.get("max_date") or now
+                time_clause = _cached_time_clause(intent["time_constraint"], max_date.strftime('%Y-%m-%d'))
                 if time_clause != "1=1":
                     where_clauses.append(time_clause)
             where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-            float_query = f'SELECT DISTINCT "float_id", MAX("latitude") as latitude, MAX("longitude") as longitude, MAX("timestamp") as timestamp FROM argo_data WHERE {where_sql} GROUP BY "float_id" ORDER BY "float_id" ASC LIMIT 20;'
-            with engine.connect() as connection:
-                floats_df = pd.read_sql_query(sql=text(float_query), con=connection)
-            floats = floats_df.to_dict(orient='records') if not floats_df.empty else []
-            float_ids = [str(row['float_id']) for row in floats]
+            cached_floats = _get_cached_float_list(where_sql)
+            if cached_floats is None:
+                # Latest position per float; DISTINCT ON walks idx_argo_float_time_lat_lon
+                # (float_id, timestamp DESC, latitude, longitude) instead of aggregating every row
+                float_query = f'SELECT DISTINCT ON ("float_id") "float_id", "latitude", "longitude", "timestamp" FROM argo_data WHERE {where_sql} ORDER BY "float_id" ASC, "timestamp" DESC LIMIT 20;'
+                # No stats are needed here, so skip the DataFrame and build records directly
+                with engine.connect() as connection:
+                    rows = connection.execution_options(stream_results=True).execute(text(float_query)).mappings().all()
+                floats = [dict(row) for row in rows]
+                cached_floats = (floats, [str(row['float_id']) for row in floats])
+                _set_cached_float_list(where_sql, cached_floats)
+            floats, float_ids = cached_floats
             msg = "No float ID specified. Please provide a valid float ID for this query."
             if float_ids:
                 msg += f" Available floats for your query: {', '.join(float_ids)}."
@@ -1836,7 +2646,7 @@ def get_intelligent_answer(user_question: str):
 
         # Out-of-range or future time check
         # Dynamic year range validation (current year + 1 grace)
-        current_year = datetime.now().year
+        current_year = now.year
         if intent.get("year"):
             try:
                 year = int(intent["year"])
@@ -1848,74 +2658,87 @@ def get_intelligent_answer(user_question: str):
                     }
             except Exception:
                 pass
-        # Location bounds check (optional, not strict)
-        # If a metric is missing in the result, fill with None or random
-        if data_records:
-            for row in data_records:
-                for m in intent.get("metrics", []):
-                    if m not in row:
-                        if intent.get("query_type") in ["Time-Series", "Profile", "Path"]:
-                            import random
-                            row[m] = round(random.uniform(10, 30), 2)
-                        elif intent.get("query_type") == "Proximity":
-                            row[m] = row.get("distance_km", 0)
-                        else:
-                            row[m] = None
-
-        num_records = len(data_records)
+
+        try:
+            existing_cols = get_argo_columns(engine)  # cached; already warm from intent parsing
+        except Exception:
+            existing_cols = frozenset()  # unknown schema: builders fall back to all columns
+        try:
+            generated_sql, sql_params = sql_builder.build_query(intent, {"max_date_obj": context.get("max_date")}, existing_cols)
+        except ValueError as ve:
+            # Specific guidance for profile/trajectory builder errors
+            return {
+                "query_type": "Error",
+                "summary": str(ve),
+                "data": [],
+                "sql_query": "N/A"
+            }
+        logging.info(f"Intent: {_json_dumps(intent)} | Generated SQL: {generated_sql} | Params: {sql_params}")
+
+        # SQL builder detected logical error
+        if isinstance(generated_sql, str) and generated_sql.startswith("ERROR:"):
+            error_msg = generated_sql[6:].strip()
+            # Provide direct error message to user (no fake fallback data)
+            return {
+                "query_type": "Error",
+                "summary": error_msg,
+                "data": [],
+                "sql_query": generated_sql
+            }
+
+        df = read_sql_frame(engine, generated_sql, sql_params)
+
+        # DataFrame column uniqueness fix (safe fallback)
+        if df.columns.has_duplicates:
+            df.columns = _dedup_column_names(df.columns)
+
+        if not df.empty:
+            for col in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+                df[col] = df[col].dt.strftime(_RECORD_TIMESTAMP_FORMAT)
+
+
+        # If a metric is missing in the result, fill with None or random.
+        # Filled column-wise on a copy used only for the records, so the summary
+        # stats keep describing the real query result
+        missing_metrics = [m for m in intent.get("metrics", []) if m not in df.columns]
+        records_df = df
+        if missing_metrics and not df.empty:
+            if intent.get("query_type") in ["Time-Series", "Profile", "Path"]:
+                fill = np.round(np.random.uniform(10, 30, size=(len(df), len(missing_metrics))), 2)
+                records_df = df.assign(**{m: fill[:, i] for i, m in enumerate(missing_metrics)})
+            elif intent.get("query_type") == "Proximity":
+                dist = df["distance_km"].to_numpy() if "distance_km" in df.columns else 0
+                records_df = df.assign(**dict.fromkeys(missing_metrics, dist))
+            else:
+                records_df = df.assign(**dict.fromkeys(missing_metrics))
+
+        # Records conversion and summary reductions are independent reads of df;
+        # overlap them (pandas/numpy reductions release the GIL)
+        data_records = []
+        summary_stats = {}
+        if not df.empty:
+            stats_future = _io_pool.submit(compute_summary_stats, df)
+            data_records = _fast_records(records_df)
+            summary_stats = stats_future.result()
+
+        num_records = len(df)
         query_type = intent.get("query_type", "General")
         
-        # Build detailed results summary based on query type
-        results_summary_text = f"Found {num_records} records."
-        
-        # Add specific statistics based on query type and data
-        if not df.empty:
-            if 'distance_km' in df.columns:
-                min_dist = df['distance_km'].min()
-                max_dist = df['distance_km'].max()
-                results_summary_text = f"Found {num_records} floats. Closest: {min_dist:.1f}km, Farthest: {max_dist:.1f}km."
-            
-            if 'float_id' in df.columns:
-                unique_floats = df['float_id'].nunique()
-                float_ids = df['float_id'].unique()[:5].tolist()
-                results_summary_text += f" {unique_floats} unique float(s): {float_ids}."
-            
-            if 'temperature' in df.columns and df['temperature'].notna().any():
-                avg_temp = df['temperature'].mean()
-                min_temp = df['temperature'].min()
-                max_temp = df['temperature'].max()
-                results_summary_text += f" Temperature: avg {avg_temp:.1f}°C (range: {min_temp:.1f} - {max_temp:.1f}°C)."
-            
-            if 'salinity' in df.columns and df['salinity'].notna().any():
-                avg_sal = df['salinity'].mean()
-                results_summary_text += f" Avg salinity: {avg_sal:.2f} PSU."
-            
-            if 'latitude' in df.columns and 'longitude' in df.columns:
-                lat_range = f"{df['latitude'].min():.1f}° to {df['latitude'].max():.1f}°N"
-                lon_range = f"{df['longitude'].min():.1f}° to {df['longitude'].max():.1f}°E"
-                results_summary_text += f" Coverage: {lat_range}, {lon_range}."
-            
-            if 'timestamp' in df.columns:
-                try:
-                    if pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-                        date_min = df['timestamp'].min().strftime('%b %d')
-                        date_max = df['timestamp'].max().strftime('%b %d, %Y')
-                    else:
-                        date_min = str(df['timestamp'].min())[:10]
-                        date_max = str(df['timestamp'].max())[:10]
-                    results_summary_text += f" Time span: {date_min} to {date_max}."
-                except:
-                    pass
-            
-            if 'pressure' in df.columns and df['pressure'].notna().any():
-                max_depth = df['pressure'].max()
-                results_summary_text += f" Max depth: {max_depth:.0f} dbar."
+        # Build detailed results summary: collect fragments, join once
+        if "distance" in summary_stats:
+            summary_parts = [f"Found {num_records} floats.", summary_stats["distance"]]
+        else:
+            summary_parts = [f"Found {num_records} records."]
+        summary_parts.extend(summary_stats[key] for key in ("floats", "temperature", "salinity", "coverage", "time_span", "depth") if key in summary_stats)
+        results_summary_text = " ".join(summary_parts)
         
         # Build sample data string for LLM context
         sample_data_str = ""
-        if data_records:
-            sample = data_records[:5]  # First 5 records as sample for better context
-            sample_data_str = json.dumps(sample, default=str)[:800]  # Increased limit
+        if num_records:
+            # Columnar form avoids repeating every key per record in the prompt;
+            # only the first 5 rows are converted
+            sample = df.head(5).to_dict(orient='list')
+            sample_data_str = _json_dumps(sample)[:800]
         
         # Handle empty results with helpful suggestions
         if num_records == 0:
@@ -1937,7 +2760,15 @@ def get_intelligent_answer(user_question: str):
                     suggestions.append("try removing the time filter")
                 if search_dist < 800:
                     suggestions.append("increase search radius (e.g., 'within 1000km')")
-                suggestions.append("try a nearby sea region like 'Bay of Bengal' or 'Arabian Sea'")
+                # Point the user at the wider regions that actually contain the search point
+                enclosing = []
+                if isinstance(intent.get("latitude"), (int, float)) and isinstance(intent.get("longitude"), (int, float)):
+                    enclosing = [r for r in locations_containing(intent["latitude"], intent["longitude"])
+                                 if r != str(location_name).lower()][:2]
+                if enclosing:
+                    suggestions.append("try a wider region like " + " or ".join(f"'{r.title()}'" for r in enclosing))
+                else:
+                    suggestions.append("try a nearby sea region like 'Bay of Bengal' or 'Arabian Sea'")
                 suggestion += ", ".join(suggestions) + "."
                 
                 results_summary_text = suggestion
@@ -1947,15 +2778,16 @@ def get_intelligent_answer(user_question: str):
             elif query_type == "Statistic":
                 time_constraint = intent.get("time_constraint", "")
                 location_name = intent.get("location_name", "")
-                results_summary_text = f"No statistics available"
+                summary_parts = ["No statistics available"]
                 if location_name:
-                    results_summary_text += f" for {location_name}"
+                    summary_parts.append(f" for {location_name}")
                 if time_constraint:
-                    results_summary_text += f" during {time_constraint}"
-                results_summary_text += f". {data_range_info}. Try a different location or time period."
+                    summary_parts.append(f" during {time_constraint}")
+                summary_parts.append(f". {data_range_info}. Try a different location or time period.")
+                results_summary_text = "".join(summary_parts)
             else:
                 time_constraint = intent.get("time_constraint", "")
-                if time_constraint and any(year in str(time_constraint).lower() for year in ["2020", "2021", "2022", "2023"]):
+                if time_constraint and _STALE_YEAR_RE.search(str(time_constraint)):
                     results_summary_text = f"The requested time period ({time_constraint}) may be outside our data range. {data_range_info}."
                 else:
                     results_summary_text = f"No matching data found for your query. {data_range_info}. Try broadening your search criteria."
@@ -1963,28 +2795,35 @@ def get_intelligent_answer(user_question: str):
             results_summary_text += f" (Limited results. {data_range_info})"
 
         # === STEP 3: Generate natural language summary with LLM ===
-        summarization_prompt = PromptTemplate.from_template(SUMMARIZATION_PROMPT)
-        summary_chain = summarization_prompt | llm | StrOutputParser()
-        
+        summary_inputs = {
+            "question": user_question, 
+            "results_summary": results_summary_text,
+            "query_type": query_type,
+            "sample_data": sample_data_str if sample_data_str else "No sample data available"
+        }
+        summary_cache_key = _llm_cache_key("summary", *map(str, summary_inputs.values()))
+        summary_from_llm = True
         try:
-            # Use retry logic for summarization too
-            summary = invoke_with_retry(summary_chain, {
-                "question": user_question, 
-                "results_summary": results_summary_text,
-                "query_type": query_type,
-                "sample_data": sample_data_str if sample_data_str else "No sample data available"
-            }, max_retries=2)
-            
-            # Clean up the summary (remove any markdown formatting)
-            summary = summary.strip()
-            if summary.startswith("```"):
-                summary = re.sub(r'^```\w*\s*', '', summary)
-                summary = re.sub(r'\s*```$', '', summary)
+            summary = _get_cached_llm_output(summary_cache_key)
+            if summary is None:
+                # Use retry logic for summarization too
+                if on_token is not None:
+                    summary = stream_with_failover("summary", summary_inputs, provider, llm, on_token, query_complexity)
+                else:
+                    summary = invoke_with_failover("summary", summary_inputs, provider, llm, query_complexity)
+                
+                # Clean up the summary (remove any markdown formatting)
+                summary = summary.strip()
+                if summary.startswith("```"):
+                    summary = _MD_FENCE_OPEN_RE.sub('', summary)
+                    summary = _MD_FENCE_CLOSE_RE.sub('', summary)
+                _set_cached_llm_output(summary_cache_key, summary)
                 
         except Exception as summary_error:
             logging.warning(f"Summarization failed: {summary_error}. Using fallback.")
             # If summarization LLM call fails, fallback to internal summary
             summary = results_summary_text
+            summary_from_llm = False
 
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -2006,6 +2845,7 @@ def get_intelligent_answer(user_question: str):
         response_payload = {
             "query_type": intent.get("query_type"),
             "sql_query": generated_sql,
+            "sql_params": sql_params,
             "summary": summary,
             "data": data_records,
             "data_range": data_range_info,
@@ -2022,6 +2862,14 @@ def get_intelligent_answer(user_question: str):
         # Debug: optionally surface parsed intent if env var set
         if os.getenv("SHOW_INTENT_JSON", "0") in ("1", "true", "yes"):
             response_payload["intent_debug"] = intent
+
+        # Degraded answers (regex-fallback intent, internal summary after an LLM
+        # failure) are served once but not cached, so they end with the outage
+        if parsed_by_llm and summary_from_llm:
+            if cache_key is not None:
+                _set_cached_response(cache_key, response_payload)
+            if question_vec is not None:
+                _set_semantic_cached_response(question_vec, _semantic_signature(question_analysis["lower"]), response_payload)
             
         return response_payload
 
@@ -4,9 +4,11 @@ import os
 # Bind to PORT from environment (Railway sets this)
 bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
 
-# Workers and threads (optimized for 512MB RAM)
-workers = 2
-threads = 2
+# Workers and threads (optimized for 512MB RAM).
+# Requests mostly wait on LLM/DB sockets, so threads are cheap concurrency;
+# keep threads <= DB pool_size + max_overflow and the LLM concurrency cap in brain.py
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
 worker_class = "gthread"
 
 # Timeout for AI/DB queries
@@ -17,6 +19,14 @@ keepalive = 30
 # Preload for shared DB connections
 preload_app = True
 
+# Warm the AI context in each worker (threads don't survive the preload fork)
+def post_fork(server, worker):
+    try:
+        from brain import start_context_refresher
+        start_context_refresher()
+    except Exception as e:
+        server.log.warning(f"Context warm-up skipped: {e}")
+
 # Logging
 accesslog = "-"
 errorlog = "-"
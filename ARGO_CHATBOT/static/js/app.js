@@ -1511,6 +1511,9 @@ async function sendQueryStreaming(question) {
         
         const reader = response.body.getReader();
         const decoder = new TextDecoder();
+        // Carries a partial line over to the next read - the final data event
+        // holds the whole result set and routinely spans several reads
+        let buffered = '';
         
         state.isStreaming = true;
         
@@ -1518,8 +1521,9 @@ async function sendQueryStreaming(question) {
             const { done, value } = await reader.read();
             if (done) break;
             
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
             
             for (const line of lines) {
                 if (line.startsWith('data: ')) {
@@ -1540,6 +1544,12 @@ async function sendQueryStreaming(question) {
                                 break;
                                 
                             case 'data':
+                                // The final summary is authoritative: it is fence-stripped and
+                                // replaces a stream cut short by a provider failover
+                                if (data.summary && data.summary !== fullSummary) {
+                                    fullSummary = data.summary;
+                                    if (messageEl) updateStreamingMessage(messageEl, fullSummary);
+                                }
                                 displayResults({
                                     query_type: data.query_type || 'General',
                                     data: data.data,
@@ -2330,8 +2340,16 @@ function updateChartTheme() {
     }
 }
 
+// Above this many samples, line charts skip bezier smoothing and per-point
+// markers (straight segments are far cheaper to compute and stroke, and a
+// marker per sample is just noise at that density; hover still shows points)
+const DENSE_SERIES_POINTS = 500;
+
 function createProfileChart(data) {
     const sorted = [...data].sort((a, b) => (a.pressure || 0) - (b.pressure || 0));
+    const dense = sorted.length > DENSE_SERIES_POINTS;
+    const tension = dense ? 0 : 0.4;
+    const pointRadius = dense ? 0 : 2;
     return {
         type: 'line',
         data: {
@@ -2342,9 +2360,9 @@ function createProfileChart(data) {
                     data: sorted.map(d => d.temperature),
                     borderColor: '#ef4444',
                     backgroundColor: 'rgba(239, 68, 68, 0.1)',
-                    tension: 0.4,
+                    tension,
                     yAxisID: 'y',
-                    pointRadius: 2,
+                    pointRadius,
                     pointHoverRadius: 6
                 },
                 {
@@ -2352,9 +2370,9 @@ function createProfileChart(data) {
                     data: sorted.map(d => d.salinity),
                     borderColor: '#3b82f6',
                     backgroundColor: 'rgba(59, 130, 246, 0.1)',
-                    tension: 0.4,
+                    tension,
                     yAxisID: 'y1',
-                    pointRadius: 2,
+                    pointRadius,
                     pointHoverRadius: 6
                 }
             ]
@@ -2362,6 +2380,7 @@ function createProfileChart(data) {
         options: {
             responsive: true,
             maintainAspectRatio: false,
+            normalized: true,  // rows are pre-sorted; skip Chart.js's own ordering checks
             interaction: { mode: 'index', intersect: false },
             plugins: {
                 legend: { position: 'top', labels: { usePointStyle: true, font: { size: 11 } } },
@@ -2379,6 +2398,9 @@ function createProfileChart(data) {
 function createTimeSeriesChart(data, column) {
     const sorted = [...data].filter(d => d.timestamp && d[column] != null)
         .sort((a, b) => new Date(a.timestamp) - new Date(b.timestamp));
+    const dense = sorted.length > DENSE_SERIES_POINTS;
+    const tension = dense ? 0 : 0.4;
+    const pointRadius = dense ? 0 : 2;
     
     return {
         type: 'line',
@@ -2389,15 +2411,16 @@ function createTimeSeriesChart(data, column) {
                 data: sorted.map(d => d[column]),
                 borderColor: '#3b82f6',
                 backgroundColor: 'rgba(59, 130, 246, 0.1)',
-                tension: 0.4,
+                tension,
                 fill: true,
-                pointRadius: 2,
+                pointRadius,
                 pointHoverRadius: 6
             }]
         },
         options: {
             responsive: true,
             maintainAspectRatio: false,
+            normalized: true,
             plugins: {
                 legend: { labels: { usePointStyle: true } },
                 tooltip: { backgroundColor: 'rgba(0,0,0,0.8)', padding: 12 }
@@ -2528,6 +2551,12 @@ function createAutoChart(data, queryType) {
 // ========================================
 // Table Display (Enhanced)
 // ========================================
+// One shared formatter; Date#toLocaleString builds a new one on every call
+const TABLE_DATE_FORMAT = new Intl.DateTimeFormat(undefined, {
+    year: 'numeric', month: 'numeric', day: 'numeric',
+    hour: 'numeric', minute: 'numeric', second: 'numeric'
+});
+
 function updateTable(data) {
     if (!el.tableHead || !el.tableBody) return;
     
@@ -2548,22 +2577,25 @@ function updateTable(data) {
     const maxRows = 100;
     const rows = data.slice(0, maxRows);
     
-    el.tableBody.innerHTML = rows.map((row, idx) => 
+    let bodyHTML = rows.map((row, idx) => 
         `<tr class="table-row" style="animation-delay: ${idx * 10}ms">` + 
         columns.map(c => {
             let val = row[c];
             if (val == null) return '<td class="null-value">—</td>';
             if (typeof val === 'number') val = val.toFixed(4);
             if (typeof val === 'string' && val.includes('T')) {
-                val = new Date(val).toLocaleString();
+                val = TABLE_DATE_FORMAT.format(new Date(val));
             }
             return `<td>${val}</td>`;
         }).join('') + '</tr>'
     ).join('');
     
     if (data.length > maxRows) {
-        el.tableBody.innerHTML += `<tr><td colspan="${columns.length}" class="table-more">+ ${data.length - maxRows} more rows...</td></tr>`;
+        bodyHTML += `<tr><td colspan="${columns.length}" class="table-more">+ ${data.length - maxRows} more rows...</td></tr>`;
     }
+    
+    // Single DOM write so the table body is parsed and laid out once
+    el.tableBody.innerHTML = bodyHTML;
 }
 
 function switchTab(tab) {
@@ -3103,16 +3135,24 @@ function showExportOptions() {
     exportAsCSV();
 }
 
+// RFC 4180 cell: quote only when needed and double embedded quotes
+// (JSON.stringify quoted every string and escaped quotes as \")
+function csvCell(value) {
+    if (value === null || value === undefined) return '';
+    const text = String(value);
+    return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
 function exportAsCSV() {
     const headers = Object.keys(state.currentData[0]);
-    const csv = [
-        headers.join(','),
-        ...state.currentData.map(row => 
-            headers.map(h => JSON.stringify(row[h] ?? '')).join(',')
-        )
-    ].join('\n');
-    
-    downloadFile(csv, `floatchart_${getDateString()}.csv`, 'text/csv');
+    // One Blob part per line: no spread copy of the rows and no joined
+    // intermediate string the size of the whole file
+    const lines = [headers.map(csvCell).join(',')];
+    for (const row of state.currentData) {
+        lines.push('\n' + headers.map(h => csvCell(row[h])).join(','));
+    }
+    
+    downloadFile(lines, `floatchart_${getDateString()}.csv`, 'text/csv');
     showToast('Exported', `${state.currentData.length} records saved as CSV`, 'success');
 }
 
@@ -3123,7 +3163,7 @@ function exportAsJSON() {
 }
 
 function downloadFile(content, filename, type) {
-    const blob = new Blob([content], { type });
+    const blob = new Blob(Array.isArray(content) ? content : [content], { type });
     const url = URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
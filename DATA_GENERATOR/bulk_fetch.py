@@ -330,16 +330,19 @@ def upload_chunk_to_database(df: pd.DataFrame, engine, chunk_size: int = 5000) -
         chunk = df.iloc[i:i + chunk_size]
         try:
             values = []
-            for _, row in chunk.iterrows():
+            for row in chunk.itertuples(index=False):
                 try:
+                    temperature = getattr(row, "temperature", None)
+                    salinity = getattr(row, "salinity", None)
+                    pressure = getattr(row, "pressure", None)
                     val = (
-                        int(row["float_id"]),
-                        row["timestamp"],
-                        float(row["latitude"]) if pd.notna(row["latitude"]) else None,
-                        float(row["longitude"]) if pd.notna(row["longitude"]) else None,
-                        float(row["temperature"]) if pd.notna(row.get("temperature")) else None,
-                        float(row["salinity"]) if pd.notna(row.get("salinity")) else None,
-                        float(row["pressure"]) if pd.notna(row.get("pressure")) else 0.0,
+                        int(row.float_id),
+                        row.timestamp,
+                        float(row.latitude) if pd.notna(row.latitude) else None,
+                        float(row.longitude) if pd.notna(row.longitude) else None,
+                        float(temperature) if pd.notna(temperature) else None,
+                        float(salinity) if pd.notna(salinity) else None,
+                        float(pressure) if pd.notna(pressure) else 0.0,
                     )
                     if val[2] is not None and val[3] is not None:
                         values.append(val)
@@ -446,16 +449,16 @@ def upload_to_database(df: pd.DataFrame, engine, chunk_size: int = 5000) -> int:
         try:
             # Prepare data tuples - ensure proper types
             values = []
-            for _, row in chunk.iterrows():
+            for row in chunk.itertuples(index=False):
                 try:
                     val = (
-                        int(row["float_id"]) if pd.notna(row["float_id"]) else None,
-                        row["timestamp"],
-                        float(row["latitude"]) if pd.notna(row["latitude"]) else None,
-                        float(row["longitude"]) if pd.notna(row["longitude"]) else None,
-                        float(row["temperature"]) if pd.notna(row["temperature"]) else None,
-                        float(row["salinity"]) if pd.notna(row["salinity"]) else None,
-                        float(row["pressure"]) if pd.notna(row["pressure"]) else 0.0,
+                        int(row.float_id) if pd.notna(row.float_id) else None,
+                        row.timestamp,
+                        float(row.latitude) if pd.notna(row.latitude) else None,
+                        float(row.longitude) if pd.notna(row.longitude) else None,
+                        float(row.temperature) if pd.notna(row.temperature) else None,
+                        float(row.salinity) if pd.notna(row.salinity) else None,
+                        float(row.pressure) if pd.notna(row.pressure) else 0.0,
                     )
                     if val[0] is not None and val[2] is not None and val[3] is not None:
                         values.append(val)
@@ -8,8 +8,9 @@ import sys
 import threading
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request
-import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import StringIO
 
 # Create blueprint for data management routes
@@ -42,6 +43,28 @@ _fetch_state = {
     "error": None
 }
 
+# Shared HTTP session so ERDDAP chunk requests reuse pooled connections
+_http_session = None
+
+
+def _get_http_session() -> requests.Session:
+    """Return the module-wide ERDDAP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        retry = Retry(
+            total=2,
+            read=0,  # a read timeout already cost the full 120s; don't wait it out again
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
 
 @data_manager_bp.route('/api/data-manager/regions')
 def get_available_regions():
@@ -127,6 +150,7 @@ def _run_fetch(region_id: str, start_dt: datetime, end_dt: datetime, server: str
     }
     
     try:
+        import pandas as pd  # only the fetch worker needs pandas; keep app startup light
         from database_utils import get_db_connection, bulk_insert
         
         region = REGIONS[region_id]
@@ -170,7 +194,7 @@ def _run_fetch(region_id: str, start_dt: datetime, end_dt: datetime, server: str
             )
             
             try:
-                response = requests.get(url, timeout=120)
+                response = _get_http_session().get(url, timeout=120)
                 if response.status_code == 200:
                     df = pd.read_csv(StringIO(response.text), skiprows=[1])
                     
@@ -191,16 +215,19 @@ def _run_fetch(region_id: str, start_dt: datetime, end_dt: datetime, server: str
                         
                         # Prepare data tuples
                         values = []
-                        for _, row in df.iterrows():
+                        for row in df.itertuples(index=False):
                             try:
+                                temperature = getattr(row, "temperature", None)
+                                salinity = getattr(row, "salinity", None)
+                                pressure = getattr(row, "pressure", None)
                                 val = (
-                                    int(row["float_id"]),
-                                    row["timestamp"],
-                                    float(row["latitude"]),
-                                    float(row["longitude"]),
-                                    float(row["temperature"]) if pd.notna(row.get("temperature")) else None,
-                                    float(row["salinity"]) if pd.notna(row.get("salinity")) else None,
-                                    float(row["pressure"]) if pd.notna(row.get("pressure")) else 0.0,
+                                    int(row.float_id),
+                                    row.timestamp,
+                                    float(row.latitude),
+                                    float(row.longitude),
+                                    float(temperature) if pd.notna(temperature) else None,
+                                    float(salinity) if pd.notna(salinity) else None,
+                                    float(pressure) if pd.notna(pressure) else 0.0,
                                 )
                                 values.append(val)
                             except:
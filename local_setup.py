@@ -201,6 +201,24 @@ def check_env_configured(project_root):
     
     return "DATABASE_URL=" in content and len(content) > 50
 
+def wait_for_server(url, max_wait=20.0):
+    """Poll url until it answers, backing off 0.1s, 0.2s, ... up to 1.6s between tries."""
+    import urllib.request
+    import urllib.error
+    deadline = time.monotonic() + max_wait
+    delay = 0.1
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return True
+        except urllib.error.HTTPError:
+            return True  # the server is up, even if this path errors
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, 1.6)
+    return False
+
 def launch_data_manager(project_root):
     """Launch the Data Manager web app."""
     data_gen_dir = project_root / "DATA_GENERATOR"
@@ -217,11 +235,9 @@ Use it to download ARGO oceanographic data.
 {Colors.WARNING}Press Ctrl+C to stop the server when done.{Colors.END}
 """)
     
-    time.sleep(1)
-    
-    # Open browser after a short delay
+    # Open browser as soon as the server answers
     def open_browser():
-        time.sleep(2)
+        wait_for_server("http://localhost:5001")
         webbrowser.open("http://localhost:5001")
     
     import threading
@@ -281,11 +297,9 @@ The Chat App will open in your browser.
 {Colors.WARNING}Press Ctrl+C to stop the server when done.{Colors.END}
 """)
     
-    time.sleep(1)
-    
-    # Open browser after a short delay
+    # Open browser as soon as the server answers
     def open_browser():
-        time.sleep(2)
+        wait_for_server("http://localhost:5000")
         webbrowser.open("http://localhost:5000")
     
     import threading